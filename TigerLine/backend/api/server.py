@@ -20,7 +20,7 @@ import os
 import sys
 import logging
 from datetime import datetime, timedelta
-from flask import Flask, jsonify, request
+from flask import Blueprint, Flask, jsonify, request
 import numpy as np
 
 # Handle both direct execution and module import
@@ -34,16 +34,19 @@ from backend.data_sources import buoy, tides, wind, sync
 from backend.waves import dispersion, transform, spectra, propagation
 from backend.surf_model import quality, config, board_recommendations, recommendations as rec_module, storage, calibration, trends, climatology
 
-# Import production config to ensure directories are created
+# Import production config (directories are created once the app exists)
 try:
     from config import production
-    # Directories are created automatically on import
 except ImportError:
+    production = None
     # Fallback - ensure directories exist
     storage.initialize_storage()
 
-# Detect if running on PythonAnywhere
-is_pythonanywhere = 'PYTHONANYWHERE_DOMAIN' in os.environ or os.environ.get('FLASK_ENV') == 'production'
+# Detect if running on PythonAnywhere (shared detection from config/env.py)
+if production is not None:
+    is_pythonanywhere = production.is_pythonanywhere
+else:
+    is_pythonanywhere = 'PYTHONANYWHERE_DOMAIN' in os.environ
 is_production = is_pythonanywhere or os.environ.get('FLASK_ENV') == 'production'
 
 # Configure logging
@@ -77,11 +80,11 @@ else:
 
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-app.config['DEBUG'] = not is_production
+# Routes live on a blueprint; create_app() builds the Flask app around it
+api = Blueprint('api', __name__)
 
 # Enable CORS for frontend
-@app.after_request
+@api.after_app_request
 def after_request(response):
     # In production, allow specific domain; in development, allow all
     if is_production:
@@ -178,8 +181,9 @@ def compute_forecast(hours=72):
         backup_station=getattr(config, 'BUOY_STATION_BACKUP', '44091')
     )
     
-    # Calculate swell trends
-    trend_data = trends.calculate_swell_trends(historical_buoy, hours=24)
+    # Calculate swell trends on the buoy series parsed into arrays once
+    buoy_history = trends.BuoyHistory.from_dict(historical_buoy)
+    trend_data = trends.calculate_swell_trends(buoy_history, hours=24)
     
     logger.info("Fetching wind data...")
     wind_data = wind.get_wind_data(config.LATITUDE, config.LONGITUDE, days=hours/24)
@@ -198,10 +202,25 @@ def compute_forecast(hours=72):
     
     forecasts = []
     
+    n_times = len(synced['times'])
+    wind_speeds = synced['wind'].get('speeds') or [5.0] * n_times
+    wind_dirs = synced['wind'].get('directions') or [180.0] * n_times
+    
+    # Forecast wave conditions at beach for every hour in one batch
+    now = datetime.now()
+    wave_forecasts = propagation.forecast_wave_conditions_batch(
+        historical_buoy,
+        synced['times'],
+        wind_speeds=wind_speeds,
+        wind_dirs=wind_dirs,
+        buoy_distance_km=propagation.BUOY_TO_BEACH_DISTANCE_KM,
+        now=now
+    )
+    
     for i, time in enumerate(synced['times']):
         # Get synchronized data for this time
-        wind_speed = synced['wind'].get('speeds', [5.0] * len(synced['times']))[i] if synced['wind'].get('speeds') else 5.0
-        wind_dir = synced['wind'].get('directions', [180.0] * len(synced['times']))[i] if synced['wind'].get('directions') else 180.0
+        wind_speed = wind_speeds[i]
+        wind_dir = wind_dirs[i]
         tide_level = synced['tide'].get('levels', [0.0] * len(synced['times']))[i] if synced['tide'].get('levels') else 0.0
         
         # Get temperature data
@@ -210,28 +229,16 @@ def compute_forecast(hours=72):
         feels_c = synced['wind'].get('feels_like_c', [])[i] if i < len(synced['wind'].get('feels_like_c', [])) else 15.0
         feels_f = synced['wind'].get('feels_like_f', [])[i] if i < len(synced['wind'].get('feels_like_f', [])) else 59.0
         
-        # Forecast wave conditions using propagation model
         # Convert time to datetime if needed
         if isinstance(time, str):
             forecast_time = datetime.fromisoformat(time.replace('Z', '+00:00'))
         elif isinstance(time, datetime):
             forecast_time = time
         else:
-            forecast_time = datetime.now() + timedelta(hours=i)
-        
-        # Get wind data for propagation
-        wind_for_propagation = {
-            'speed_ms': wind_speed,
-            'direction_deg': wind_dir
-        }
+            forecast_time = now + timedelta(hours=i)
         
-        # Forecast wave conditions at beach for this time
-        wave_forecast = propagation.forecast_wave_conditions(
-            historical_buoy,
-            forecast_time,
-            wind_data=wind_for_propagation,
-            buoy_distance_km=propagation.BUOY_TO_BEACH_DISTANCE_KM
-        )
+        # Wave conditions at beach for this time
+        wave_forecast = {key: float(values[i]) for key, values in wave_forecasts.items()}
         
         # Extract forecasted wave parameters
         Hs_offshore_raw = wave_forecast['Hs']
@@ -278,6 +285,7 @@ def compute_forecast(hours=72):
             gamma_b=config.GAMMA_B,
             return_path=True
         )
+        shoaling_path = transform.path_as_dicts(shoaling_path)  # Plain floats for JSON
         
         # Convert breaking angle back to degrees
         theta_break_deg = np.rad2deg(theta_break)
@@ -414,7 +422,7 @@ def compute_forecast(hours=72):
                     'type': str(breaker_type)
                 },
                 'iribarren_number': float(Xi),
-                'shoaling_path': ensure_json_serializable(shoaling_path),
+                'shoaling_path': shoaling_path,
                 'shoaling_path_surf': ensure_json_serializable([
                     {**p, 'H': p['H'] / 1.6, 'H_hs': p['H']} for p in shoaling_path
                 ]),  # Convert to surf height for graph
@@ -473,7 +481,7 @@ def compute_forecast(hours=72):
     return forecasts
 
 
-@app.route('/', methods=['GET'])
+@api.route('/', methods=['GET'])
 def root():
     """Root endpoint - redirects to frontend."""
     return jsonify({
@@ -488,7 +496,7 @@ def root():
     }), 200
 
 
-@app.route('/health', methods=['GET'])
+@api.route('/health', methods=['GET'])
 def health():
     """Health check endpoint."""
     return jsonify({
@@ -497,7 +505,7 @@ def health():
     })
 
 
-@app.route('/climatology', methods=['GET'])
+@api.route('/climatology', methods=['GET'])
 def get_climatology():
     """
     Get climatology data (monthly statistics).
@@ -534,7 +542,7 @@ def get_climatology():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/calibration/status', methods=['GET'])
+@api.route('/calibration/status', methods=['GET'])
 def calibration_status():
     """
     Get calibration status and data.
@@ -578,7 +586,7 @@ def calibration_status():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/observations', methods=['POST'])
+@api.route('/observations', methods=['POST'])
 def add_observation():
     """
     Add human observation/rating for a specific timestamp.
@@ -624,24 +632,15 @@ def add_observation():
         except ValueError:
             return jsonify({'error': 'Invalid timestamp format. Use ISO format: YYYY-MM-DDTHH:MM:SS'}), 400
         
-        # Load existing observation for this timestamp
-        # Find observation file for this date
-        date_str = obs_time.strftime('%Y-%m-%d')
-        file_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            'data', 'observations', f"{date_str}.json"
-        )
-        
-        if not os.path.exists(file_path):
-            return jsonify({'error': f'No forecast data found for timestamp {timestamp_str}'}), 404
-        
-        # Load observations
+        # Load existing observations for this date
         try:
-            with open(file_path, 'r') as f:
-                observations = json.load(f)
+            observations = storage.load_day_observations(obs_time)
         except (json.JSONDecodeError, IOError) as e:
             return jsonify({'error': f'Failed to load observations: {e}'}), 500
         
+        if not observations:
+            return jsonify({'error': f'No forecast data found for timestamp {timestamp_str}'}), 404
+        
         # Find matching observation (within 1 hour window)
         found = False
         for obs in observations:
@@ -662,8 +661,7 @@ def add_observation():
         
         # Save updated observations
         try:
-            with open(file_path, 'w') as f:
-                json.dump(observations, f, indent=2)
+            storage.save_day_observations(obs_time, observations)
         except IOError as e:
             return jsonify({'error': f'Failed to save observation: {e}'}), 500
         
@@ -680,7 +678,7 @@ def add_observation():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/forecast', methods=['GET'])
+@api.route('/forecast', methods=['GET'])
 def get_forecast():
     """
     Main forecast endpoint.
@@ -737,7 +735,7 @@ def get_forecast():
         }), 500
 
 
-@app.route('/forecast/physics', methods=['GET'])
+@api.route('/forecast/physics', methods=['GET'])
 def get_forecast_physics():
     """
     Detailed physics view endpoint.
@@ -809,7 +807,7 @@ def get_forecast_physics():
 
 
 # Production error handlers
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
     logger.warning(f"404 error: {request.url}")
@@ -819,7 +817,7 @@ def not_found(error):
         'timestamp': datetime.now().isoformat()
     }), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
     logger.error(f"500 error: {error}", exc_info=True)
@@ -837,7 +835,7 @@ def internal_error(error):
             'timestamp': datetime.now().isoformat()
         }), 500
 
-@app.errorhandler(Exception)
+@api.app_errorhandler(Exception)
 def handle_exception(e):
     """Handle all unhandled exceptions."""
     logger.error(f"Unhandled exception: {e}", exc_info=True)
@@ -854,6 +852,26 @@ def handle_exception(e):
         }), 500
 
 
+def create_app():
+    """
+    Create and configure the Flask application.
+    
+    Directory setup from config/production.py runs here rather than when
+    this module is imported.
+    
+    Returns:
+    --------
+    Flask
+        Application with the API routes and error handlers registered
+    """
+    app = Flask(__name__)
+    app.config['DEBUG'] = not is_production
+    app.register_blueprint(api)
+    if production is not None:
+        production.init_app(app)
+    return app
+
+
 if __name__ == '__main__':
     # Only run development server when executed directly (not via WSGI)
     import socket
@@ -894,4 +912,5 @@ if __name__ == '__main__':
     print("")
     
     # Development server only
+    app = create_app()
     app.run(debug=not is_production, use_reloader=False, host='0.0.0.0', port=port)
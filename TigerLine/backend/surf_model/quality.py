@@ -8,7 +8,8 @@ Uses transparent, piecewise-linear rules based on physical parameters.
 REVISED: Stricter scoring to target realistic average of 4-5/10.
 """
 
-import numpy as np
+import math
+
 from ..waves.stats import angle_between
 
 
@@ -347,6 +348,32 @@ def breaker_type_multiplier(breaker_type):
     return multipliers.get(breaker_type.lower(), 0.7)
 
 
+# Multiplicative penalties, one per bit of the condition mask built in
+# apply_penalties (bit 0 first):
+#   0: small waves (< 3 ft) + onshore wind = devastating combination
+#   1: very small waves (< 2.5 ft) = essentially unrideable
+#   2: small waves (< 3 ft) = not worth it
+#   3: ANY onshore wind = ruins conditions
+#   4: S/SSW swell (180-225 deg) = not well exposed
+#   5: large waves (> 8 ft) + short period (< 8 s) = closing out
+#   6: onshore wind + short period (< 7 s) = mushy mess
+#   7: straight-in waves (< 5 deg) + onshore wind = terrible
+_PENALTY_FACTORS = (0.1, 0.2, 0.4, 0.3, 0.7, 0.5, 0.5, 0.4)
+
+
+def _penalty_product(mask):
+    """Product of the penalty factors whose bits are set in mask."""
+    penalty = 1.0
+    for bit, factor in enumerate(_PENALTY_FACTORS):
+        if mask & (1 << bit):
+            penalty *= factor
+    return penalty
+
+
+# Precomputed penalty product for every combination of conditions
+_PENALTY_LUT = tuple(_penalty_product(mask) for mask in range(1 << len(_PENALTY_FACTORS)))
+
+
 def apply_penalties(S_base, Hb_ft, T, theta_break, wind_type, U, eta_tide, swell_dir_coming_from):
     """
     Apply multiplicative penalties for bad condition combinations.
@@ -380,40 +407,21 @@ def apply_penalties(S_base, Hb_ft, T, theta_break, wind_type, U, eta_tide, swell
     penalty_multiplier : float
         Multiplier to apply to base score (0-1)
     """
-    penalty = 1.0
-    
-    # CRITICAL PENALTY: Small waves + onshore wind = unrideable
-    if Hb_ft < 3.0 and wind_type == 'onshore':
-        penalty *= 0.1  # Devastating combination - 90% penalty
-    
-    # CRITICAL PENALTY: Very small waves (< 2.5 ft) = essentially unrideable
-    if Hb_ft < 2.5:
-        penalty *= 0.2  # 80% penalty - unrideable
-    
-    # CRITICAL PENALTY: Small waves (< 3 ft) = not worth it
-    if Hb_ft < 3.0:
-        penalty *= 0.4  # 60% penalty
-    
-    # CRITICAL PENALTY: ANY onshore wind = ruins conditions
-    if wind_type == 'onshore':
-        penalty *= 0.3  # 70% penalty for onshore
-    
-    # Penalty: S/SSW swell (not well exposed)
+    onshore = wind_type == 'onshore'
     dir_norm = swell_dir_coming_from % 360
-    if 180 <= dir_norm <= 225:
-        penalty *= 0.7
-    
-    # Penalty: Large waves + short period = closing out
-    if Hb_ft > 8.0 and T < 8.0:
-        penalty *= 0.5
-    
-    # Penalty: Onshore wind + short period = mushy mess
-    if wind_type == 'onshore' and T < 7.0:
-        penalty *= 0.5  # Additional penalty
     
-    # Penalty: Straight-in waves + onshore wind = terrible
-    if abs(theta_break) < 5.0 and wind_type == 'onshore':
-        penalty *= 0.4  # Additional penalty
+    # Encode each penalty condition as one bit (see _PENALTY_FACTORS)
+    mask = (
+        (Hb_ft < 3.0 and onshore) |
+        (Hb_ft < 2.5) << 1 |
+        (Hb_ft < 3.0) << 2 |
+        onshore << 3 |
+        (180 <= dir_norm <= 225) << 4 |
+        (Hb_ft > 8.0 and T < 8.0) << 5 |
+        (onshore and T < 7.0) << 6 |
+        (abs(theta_break) < 5.0 and onshore) << 7
+    )
+    penalty = _PENALTY_LUT[mask]
     
     # Penalty: Extreme tide + large waves = may not break properly
     dist_from_mean = abs(eta_tide)
@@ -423,6 +431,16 @@ def apply_penalties(S_base, Hb_ft, T, theta_break, wind_type, U, eta_tide, swell
     return penalty
 
 
+# Weights - adjusted to emphasize height and wind (most critical)
+SCORE_WEIGHTS = {
+    'H': 0.30,  # Wave height is CRITICAL - can't surf without waves
+    'T': 0.20,  # Period matters but less than height
+    'dir': 0.15,  # Direction affects quality
+    'wind': 0.30,  # Wind can completely ruin conditions
+    'tide': 0.05  # Tide matters least
+}
+
+
 def compute_surf_score(Hb, T, theta_break, breaker_type, U, wind_dir, eta_tide, swell_dir_coming_from):
     """
     Compute final surf quality score (0-10) from all physical parameters.
@@ -463,6 +481,8 @@ def compute_surf_score(Hb, T, theta_break, breaker_type, U, wind_dir, eta_tide,
             Final surf score (0-10)
         sub_scores : dict
             All individual sub-scores for transparency
+        weights : dict
+            Weights used for the base score (a fresh copy per call)
         physical_params : dict
             Physical parameters used
     """
@@ -480,21 +500,12 @@ def compute_surf_score(Hb, T, theta_break, breaker_type, U, wind_dir, eta_tide,
     
     S_tide = tide_subscore(eta_tide)
     
-    # Weights - adjusted to emphasize height and wind (most critical)
-    weights = {
-        'H': 0.30,  # Wave height is CRITICAL - can't surf without waves
-        'T': 0.20,  # Period matters but less than height
-        'dir': 0.15,  # Direction affects quality
-        'wind': 0.30,  # Wind can completely ruin conditions
-        'tide': 0.05  # Tide matters least
-    }
-    
     S_base = (
-        weights['H'] * S_H +
-        weights['T'] * S_T +
-        weights['dir'] * S_dir +
-        weights['wind'] * S_wind +
-        weights['tide'] * S_tide
+        SCORE_WEIGHTS['H'] * S_H +
+        SCORE_WEIGHTS['T'] * S_T +
+        SCORE_WEIGHTS['dir'] * S_dir +
+        SCORE_WEIGHTS['wind'] * S_wind +
+        SCORE_WEIGHTS['tide'] * S_tide
     )
     
     # Apply penalties for bad combinations
@@ -507,7 +518,9 @@ def compute_surf_score(Hb, T, theta_break, breaker_type, U, wind_dir, eta_tide,
     
     # Map to 0-10 scale
     surf_score = 10.0 * S_final
-    surf_score = float(np.clip(surf_score, 0.0, 10.0))  # Ensure Python float
+    if not math.isnan(surf_score):  # NaN passes through, as with np.clip
+        surf_score = min(10.0, max(0.0, surf_score))
+    surf_score = float(surf_score)  # Ensure Python float
     
     return {
         'surf_score': surf_score,
@@ -518,7 +531,7 @@ def compute_surf_score(Hb, T, theta_break, breaker_type, U, wind_dir, eta_tide,
             'wind': float(S_wind),
             'tide': float(S_tide)
         },
-        'weights': weights,
+        'weights': dict(SCORE_WEIGHTS),  # Copy - callers may edit the result
         'penalty_multiplier': float(penalty),
         'breaker_multiplier': float(M_break),
         'base_score': float(S_base),
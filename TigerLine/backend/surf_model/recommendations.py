@@ -8,6 +8,8 @@ Provides:
 - Actionable recommendations
 """
 
+import heapq
+
 
 def get_condition_descriptor(surf_score, wind_type, wind_speed_ms, period_s, wave_height_ft):
     """
@@ -175,14 +177,28 @@ def find_best_time_windows(forecasts, window_hours=3):
     if len(forecasts) < window_hours:
         return []
     
+    scores = [f['surf_score'] for f in forecasts]
+    
+    # Single sweep keeping only the current top 3 in a min-heap of
+    # (average, -start_index) so earlier windows win ties. Each window is
+    # summed directly rather than with a rolling sum, whose rounding drift
+    # would reorder windows with equal averages.
+    top = []
+    for i in range(len(scores) - window_hours + 1):
+        candidate = (sum(scores[i:i + window_hours]) / window_hours, -i)
+        if len(top) < 3:
+            heapq.heappush(top, candidate)
+        elif candidate > top[0]:
+            heapq.heapreplace(top, candidate)
+    
     windows = []
     
-    for i in range(len(forecasts) - window_hours + 1):
-        window_forecasts = forecasts[i:i + window_hours]
-        scores = [f['surf_score'] for f in window_forecasts]
-        avg_score = sum(scores) / len(scores)
-        min_score = min(scores)
-        max_score = max(scores)
+    for _, neg_start in top:
+        window_forecasts = forecasts[-neg_start:-neg_start + window_hours]
+        window_scores = scores[-neg_start:-neg_start + window_hours]
+        avg_score = sum(window_scores) / len(window_scores)
+        min_score = min(window_scores)
+        max_score = max(window_scores)
         
         # Get conditions for reasoning
         first = window_forecasts[0]
@@ -205,8 +221,7 @@ def find_best_time_windows(forecasts, window_hours=3):
     # Sort by average score descending, then by start time ascending
     windows.sort(key=lambda x: (-x['average_score'], x['start_time']))
     
-    # Return top 3 windows by score, but they'll be ordered chronologically within same score
-    return windows[:3]
+    return windows
 
 
 def generate_recommendation_text(forecast_entry):
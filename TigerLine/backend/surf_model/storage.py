@@ -6,16 +6,31 @@ Stores:
 - Human observations (ratings, tags)
 - Historical data for calibration and learning
 
-Storage format: JSON files in data/observations/YYYY-MM-DD.json
+Storage format: newline-delimited JSON (one observation per line) in
+data/observations/YYYY-MM-DD.jsonl. Legacy YYYY-MM-DD.json files holding a
+single JSON array are still read.
 """
 
 import json
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Optional C-accelerated JSON codec for observation records
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional streaming parser for large legacy JSON-array day files
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Import production config for paths
 try:
     from config import production
@@ -33,12 +48,25 @@ except ImportError:
     CALIBRATION_DIR = os.path.join(DATA_DIR, 'calibration')
     CLIMATOLOGY_DIR = os.path.join(DATA_DIR, 'climatology')
 
+# Sidecar index of per-day-file record counts (see _refresh_index)
+INDEX_FILENAME = '_index.json'
+
+
+# Set once initialize_storage() has created the directories in this process
+_init_done = False
+
 
 def initialize_storage():
-    """Create data directory structure if it doesn't exist."""
+    """Create data directory structure if it doesn't exist (once per process)."""
+    global _init_done
+    if _init_done:
+        return
+    
     for directory in [DATA_DIR, OBSERVATIONS_DIR, CALIBRATION_DIR, CLIMATOLOGY_DIR]:
         os.makedirs(directory, exist_ok=True)
         logger.debug(f"Ensured directory exists: {directory}")
+    
+    _init_done = True
 
 
 def _get_observation_file_path(timestamp):
@@ -53,17 +81,203 @@ def _get_observation_file_path(timestamp):
     Returns:
     --------
     file_path : str
-        Path to observation file (YYYY-MM-DD.json)
+        Path to observation file (YYYY-MM-DD.jsonl)
     """
     if isinstance(timestamp, str):
         timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
     
     date_str = timestamp.strftime('%Y-%m-%d')
-    filename = f"{date_str}.json"
+    filename = f"{date_str}.jsonl"
     return os.path.join(OBSERVATIONS_DIR, filename)
 
 
-def store_observation(timestamp, offshore_data, local_data, model_prediction, human_rating=None, tags=None):
+def _get_legacy_file_path(file_path):
+    """Get the legacy JSON-array path (YYYY-MM-DD.json) for a .jsonl day file."""
+    return file_path[:-len('.jsonl')] + '.json'
+
+
+def _is_observation_file(filename):
+    """Check whether filename is a day file (.jsonl or legacy .json)."""
+    if filename.startswith('_'):
+        return False  # Sidecar files such as _index.json
+    return filename.endswith('.jsonl') or filename.endswith('.json')
+
+
+def _is_rated(obs):
+    """Check whether an observation carries a human rating."""
+    return 'observation' in obs and 'rating' in obs['observation']
+
+
+def _load_index():
+    """Load the sidecar count index, or {} if it is missing or unreadable."""
+    try:
+        with open(os.path.join(OBSERVATIONS_DIR, INDEX_FILENAME), 'rb') as f:
+            index = _decode_record(f.read())
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index):
+    """Atomically rewrite the sidecar count index. Failures are only logged."""
+    index_path = os.path.join(OBSERVATIONS_DIR, INDEX_FILENAME)
+    tmp_path = index_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_encode_record(index))
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.warning(f"Failed to write observation index: {e}")
+
+
+def _index_entry(st, count, rated):
+    """Build an index entry for a day file with stat result st."""
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'count': count, 'rated': rated}
+
+
+def _index_record_append(file_path, st, record_size, rated, line_start=True):
+    """
+    Update the sidecar index after appending one record to a day file.
+    
+    The entry is only incremented if it described the file exactly as it was
+    before the append and that file ended in a newline; otherwise it is
+    dropped and rebuilt on the next scan.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Day file that was appended to
+    st : os.stat_result
+        Stat of the day file after the append
+    record_size : int
+        Number of bytes appended
+    rated : bool
+        Whether the appended record carries a human rating
+    line_start : bool, optional
+        False if the file did not end in a newline before the append (a torn
+        line), in which case the indexed count cannot be trusted
+    """
+    name = os.path.basename(file_path)
+    index = _load_index()
+    entry = index.get(name)
+    
+    if not line_start:
+        index.pop(name, None)
+    elif entry is not None and entry.get('size') == st.st_size - record_size:
+        index[name] = _index_entry(st, entry['count'] + 1, entry['rated'] + int(rated))
+    elif entry is None and st.st_size == record_size:
+        index[name] = _index_entry(st, 1, int(rated))  # New day file
+    else:
+        index.pop(name, None)
+    
+    _save_index(index)
+
+
+def _refresh_index():
+    """
+    Validate the sidecar index against the observations directory.
+    
+    Performs a single directory scan; files whose mtime/size match their index
+    entry are not opened. Missing or stale entries are rebuilt by parsing the
+    file, and the index is rewritten if anything changed.
+    
+    Returns:
+    --------
+    index : dict
+        Mapping filename -> {'mtime_ns', 'size', 'count', 'rated'}
+    """
+    index = _load_index()
+    fresh = {}
+    changed = False
+    
+    with os.scandir(OBSERVATIONS_DIR) as entries:
+        for entry in entries:
+            if not (_is_observation_file(entry.name) and entry.is_file(follow_symlinks=False)):
+                continue
+            st = entry.stat()
+            info = index.get(entry.name)
+            if (info is None or info.get('mtime_ns') != st.st_mtime_ns
+                    or info.get('size') != st.st_size):
+                try:
+                    observations = _load_day_cached(entry.path, st)
+                except (json.JSONDecodeError, IOError):
+                    continue
+                info = _index_entry(st, len(observations),
+                                    sum(1 for obs in observations if _is_rated(obs)))
+                changed = True
+            fresh[entry.name] = info
+    
+    if changed or len(fresh) != len(index):
+        _save_index(fresh)
+    
+    return fresh
+
+
+def _encode_record(record):
+    """Serialize one observation as a compact JSON line (bytes, newline-terminated)."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _decode_record(data):
+    """Parse one JSON document from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _read_day_file(file_path):
+    """
+    Read all observations from a single day file.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to a .jsonl day file, or a legacy .json array file
+        
+    Returns:
+    --------
+    observations : list of dict
+        Observations in file order
+    """
+    with open(file_path, 'rb') as f:
+        if not file_path.endswith('.jsonl'):
+            return _decode_record(f.read())
+        
+        observations = []
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                observations.append(_decode_record(line))
+            except json.JSONDecodeError as e:
+                # A torn line from an interrupted write loses only that record;
+                # store_observation starts every append on a fresh line
+                logger.warning(f"Skipping malformed line in {file_path}: {e}")
+        return observations
+
+
+def _iter_legacy_file(file_path):
+    """
+    Yield records from a legacy JSON-array day file.
+    
+    Streams the array with ijson when it is installed, so a large day is
+    never held in memory as a whole; otherwise falls back to a full parse.
+    Malformed files raise ValueError either way.
+    """
+    with open(file_path, 'rb') as f:
+        if ijson is None:
+            yield from _decode_record(f.read())
+        else:
+            try:
+                yield from ijson.items(f, 'item', use_float=True)
+            except ijson.JSONError as e:  # Includes IncompleteJSONError
+                raise ValueError(f"Malformed legacy file {file_path}: {e}") from e
+
+
+def store_observation(timestamp, offshore_data, local_data, model_prediction, human_rating=None, tags=None,
+                      durable=False):
     """
     Store a single observation.
     
@@ -81,6 +295,8 @@ def store_observation(timestamp, offshore_data, local_data, model_prediction, hu
         Human rating (0-10)
     tags : list of str, optional
         Tags like ['barreling', 'mushy', 'close-out']
+    durable : bool, optional
+        If True, fsync the day file before returning (default False)
         
     Returns:
     --------
@@ -96,21 +312,12 @@ def store_observation(timestamp, offshore_data, local_data, model_prediction, hu
         else:
             obs_time = timestamp
         
-        # Load existing observations for this day
         file_path = _get_observation_file_path(obs_time)
-        observations = []
-        
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r') as f:
-                    observations = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Failed to load existing observations: {e}. Starting fresh.")
-                observations = []
         
         # Create observation entry
         observation = {
             'timestamp': obs_time.isoformat(),
+            'ts_epoch': obs_time.timestamp(),  # For filtering/sorting without parsing
             'offshore': offshore_data,
             'local': local_data,
             'model': model_prediction
@@ -122,12 +329,27 @@ def store_observation(timestamp, offshore_data, local_data, model_prediction, hu
                 'tags': tags if tags else []
             }
         
-        # Add to observations list
-        observations.append(observation)
+        # Append as a single line with one O_APPEND write - no need to parse or
+        # rewrite the day file, and concurrent writers cannot clobber each other
+        record = _encode_record(observation)
+        fd = os.open(file_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            # If the file ends in a torn line (no trailing newline), start the
+            # record on a fresh line so it is not merged into the bad one
+            line_start = True
+            if os.fstat(fd).st_size > 0:
+                os.lseek(fd, -1, os.SEEK_END)
+                if os.read(fd, 1) != b'\n':
+                    record = b'\n' + record
+                    line_start = False
+            os.write(fd, record)
+            if durable:
+                os.fsync(fd)
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
         
-        # Save back to file
-        with open(file_path, 'w') as f:
-            json.dump(observations, f, indent=2)
+        _index_record_append(file_path, st, len(record), human_rating is not None, line_start)
         
         logger.debug(f"Stored observation for {obs_time.isoformat()}")
         return True
@@ -137,6 +359,94 @@ def store_observation(timestamp, offshore_data, local_data, model_prediction, hu
         return False
 
 
+@lru_cache(maxsize=256)
+def _load_day(file_path, mtime_ns, size):
+    """
+    Parse a day file, memoized on its path, modification time and size.
+    
+    Any write to the file changes mtime/size and therefore the cache key, so
+    stale entries are never returned. Call _load_day.cache_clear() to drop
+    all cached days.
+    
+    Returns:
+    --------
+    observations : tuple of dict
+        Shared cached records - callers must not mutate them
+    """
+    return tuple(_read_day_file(file_path))
+
+
+def _load_day_cached(file_path, st=None):
+    """Read a day file through the _load_day cache (st: optional os.stat result)."""
+    if st is None:
+        st = os.stat(file_path)
+    return _load_day(file_path, st.st_mtime_ns, st.st_size)
+
+
+def _observation_epoch(obs):
+    """Observation time as Unix epoch seconds; only legacy records need parsing."""
+    ts_epoch = obs.get('ts_epoch')
+    if ts_epoch is None:
+        ts_epoch = datetime.fromisoformat(obs['timestamp'].replace('Z', '+00:00')).timestamp()
+    return ts_epoch
+
+
+def load_day_observations(timestamp):
+    """
+    Load every observation stored for the day containing timestamp.
+    
+    Parameters:
+    -----------
+    timestamp : datetime or str
+        Any timestamp within the day
+        
+    Returns:
+    --------
+    observations : list of dict
+        Observations for that day (legacy file first), empty if none stored.
+        Read fresh (not from the parse cache) so they are safe to edit.
+        
+    Raises:
+    -------
+    json.JSONDecodeError, IOError
+        If a day file exists but cannot be read
+    """
+    file_path = _get_observation_file_path(timestamp)
+    observations = []
+    for path in (_get_legacy_file_path(file_path), file_path):
+        if os.path.exists(path):
+            observations.extend(_read_day_file(path))
+    return observations
+
+
+def save_day_observations(timestamp, observations):
+    """
+    Replace all observations stored for the day containing timestamp.
+    
+    Used for in-place edits (e.g. attaching a human rating). The day is
+    rewritten atomically as .jsonl and any legacy .json file for it is removed,
+    since its records are now part of the new file.
+    
+    Parameters:
+    -----------
+    timestamp : datetime or str
+        Any timestamp within the day
+    observations : list of dict
+        Complete list of observations for that day
+    """
+    initialize_storage()
+    file_path = _get_observation_file_path(timestamp)
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        for obs in observations:
+            f.write(_encode_record(obs))
+    os.replace(tmp_path, file_path)
+    
+    legacy_path = _get_legacy_file_path(file_path)
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+
+
 def load_observations(start_date, end_date):
     """
     Load observations between start_date and end_date.
@@ -151,7 +461,9 @@ def load_observations(start_date, end_date):
     Returns:
     --------
     observations : list of dict
-        List of observation dictionaries
+        List of observation dictionaries. These are shared with the day-file
+        parse cache and must be treated as read-only; use
+        load_day_observations() to get copies that are safe to edit.
     """
     try:
         # Convert to datetime if needed
@@ -162,30 +474,44 @@ def load_observations(start_date, end_date):
         
         all_observations = []
         
-        # Iterate through each day
-        current_date = start_date.date()
-        end_date_obj = end_date.date()
+        if not os.path.exists(OBSERVATIONS_DIR):
+            return []
+        
+        start_epoch = start_date.timestamp()
+        end_epoch = end_date.timestamp()
         
-        while current_date <= end_date_obj:
-            file_path = os.path.join(OBSERVATIONS_DIR, f"{current_date.strftime('%Y-%m-%d')}.json")
-            
-            if os.path.exists(file_path):
+        # Day files (current and legacy) that can hold observations in range
+        first_day = start_date.date()
+        wanted = set()
+        for i in range((end_date.date() - first_day).days + 1):
+            date_str = (first_day + timedelta(days=i)).isoformat()
+            wanted.add(f"{date_str}.jsonl")
+            wanted.add(f"{date_str}.json")
+        
+        # One directory pass instead of an existence check per day
+        with os.scandir(OBSERVATIONS_DIR) as entries:
+            for entry in entries:
+                if entry.name not in wanted or not entry.is_file(follow_symlinks=False):
+                    continue
                 try:
-                    with open(file_path, 'r') as f:
-                        day_observations = json.load(f)
-                        
-                        # Filter by timestamp
-                        for obs in day_observations:
-                            obs_time = datetime.fromisoformat(obs['timestamp'].replace('Z', '+00:00'))
-                            if start_date <= obs_time <= end_date:
-                                all_observations.append(obs)
-                except (json.JSONDecodeError, IOError) as e:
-                    logger.warning(f"Failed to load observations from {file_path}: {e}")
-            
-            current_date += timedelta(days=1)
+                    if entry.name.endswith('.jsonl') or ijson is None:
+                        day_observations = _load_day_cached(entry.path, entry.stat())
+                    else:
+                        # Legacy arrays are filtered as they stream in
+                        day_observations = _iter_legacy_file(entry.path)
+                    
+                    # Filter by timestamp; collect the whole file first so a
+                    # file that fails part-way contributes nothing
+                    in_range = [
+                        obs for obs in day_observations
+                        if start_epoch <= _observation_epoch(obs) <= end_epoch
+                    ]
+                    all_observations.extend(in_range)
+                except (ValueError, IOError) as e:
+                    logger.warning(f"Failed to load observations from {entry.path}: {e}")
         
         # Sort by timestamp
-        all_observations.sort(key=lambda x: x['timestamp'])
+        all_observations.sort(key=_observation_epoch)
         
         return all_observations
         
@@ -204,21 +530,10 @@ def get_observation_count():
         Total number of observations
     """
     try:
-        count = 0
         if not os.path.exists(OBSERVATIONS_DIR):
             return 0
         
-        for filename in os.listdir(OBSERVATIONS_DIR):
-            if filename.endswith('.json'):
-                file_path = os.path.join(OBSERVATIONS_DIR, filename)
-                try:
-                    with open(file_path, 'r') as f:
-                        observations = json.load(f)
-                        count += len(observations)
-                except (json.JSONDecodeError, IOError):
-                    continue
-        
-        return count
+        return sum(info['count'] for info in _refresh_index().values())
         
     except Exception as e:
         logger.error(f"Failed to count observations: {e}")
@@ -232,7 +547,8 @@ def get_observations_with_ratings():
     Returns:
     --------
     observations : list of dict
-        List of observations with 'observation' key containing rating
+        List of observations with 'observation' key containing rating.
+        Shared with the parse cache - treat as read-only (see load_observations)
     """
     try:
         all_observations = []
@@ -240,21 +556,19 @@ def get_observations_with_ratings():
         if not os.path.exists(OBSERVATIONS_DIR):
             return []
         
-        # Load all observation files
-        for filename in os.listdir(OBSERVATIONS_DIR):
-            if filename.endswith('.json'):
-                file_path = os.path.join(OBSERVATIONS_DIR, filename)
-                try:
-                    with open(file_path, 'r') as f:
-                        observations = json.load(f)
-                        for obs in observations:
-                            if 'observation' in obs and 'rating' in obs['observation']:
-                                all_observations.append(obs)
-                except (json.JSONDecodeError, IOError):
-                    continue
+        # Only open day files the index says contain rated observations
+        for name, info in _refresh_index().items():
+            if not info['rated']:
+                continue
+            try:
+                for obs in _load_day_cached(os.path.join(OBSERVATIONS_DIR, name)):
+                    if _is_rated(obs):
+                        all_observations.append(obs)
+            except (json.JSONDecodeError, IOError):
+                continue
         
         # Sort by timestamp
-        all_observations.sort(key=lambda x: x['timestamp'])
+        all_observations.sort(key=_observation_epoch)
         
         return all_observations
         
@@ -16,6 +16,58 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _align_to_times(values, n):
+    """Float array of values matched to n timestamps (short series repeat their last value)."""
+    values = np.asarray(values, dtype=np.float64)[:n]
+    if len(values) < n:
+        values = np.concatenate([values, np.full(n - len(values), values[-1])])
+    return values
+
+
+class BuoyHistory:
+    """
+    Buoy time series stored as parallel NumPy arrays.
+    
+    Build once with BuoyHistory.from_dict() when buoy data is loaded, then
+    pass to calculate_swell_trends() to skip per-call list conversion and
+    timestamp parsing.
+    
+    Attributes:
+    -----------
+    t : np.ndarray of datetime64[us]
+        Observation times
+    Hs : np.ndarray of float64
+        Significant wave height (m), aligned to t
+    Tp : np.ndarray of float64
+        Peak period (s), aligned to t
+    """
+    
+    __slots__ = ('t', 'Hs', 'Tp')
+    
+    def __init__(self, t, Hs, Tp):
+        self.t = t
+        self.Hs = Hs
+        self.Tp = Tp
+    
+    @classmethod
+    def from_dict(cls, historical_buoy_data):
+        """
+        Convert buoy data with 'times', 'Hs', 'Tp' lists into arrays.
+        
+        Times may be datetime objects or ISO strings. Hs/Tp series shorter
+        than times repeat their last value.
+        """
+        t = np.array(historical_buoy_data['times'], dtype='datetime64[us]')
+        if len(t) < 2:
+            return cls(t, np.zeros(len(t)), np.zeros(len(t)))
+        return cls(t,
+                   _align_to_times(historical_buoy_data['Hs'], len(t)),
+                   _align_to_times(historical_buoy_data['Tp'], len(t)))
+    
+    def __len__(self):
+        return len(self.t)
+
+
 def calculate_swell_trends(historical_buoy_data, hours=24):
     """
     Calculate swell trends from historical buoy data.
@@ -24,8 +76,9 @@ def calculate_swell_trends(historical_buoy_data, hours=24):
     
     Parameters:
     -----------
-    historical_buoy_data : dict
-        Historical buoy data with 'times', 'Hs', 'Tp' lists
+    historical_buoy_data : BuoyHistory or dict
+        Historical buoy data, either pre-converted or with 'times', 'Hs',
+        'Tp' lists
     hours : int
         Number of hours to analyze (default 24)
         
@@ -34,7 +87,9 @@ def calculate_swell_trends(historical_buoy_data, hours=24):
     trend_data : dict
         Dictionary with 'dHs_dt', 'dTp_dt', 'Hs_change', 'Tp_change'
     """
-    if not historical_buoy_data or 'times' not in historical_buoy_data:
+    if isinstance(historical_buoy_data, BuoyHistory):
+        history = historical_buoy_data
+    elif not historical_buoy_data or 'times' not in historical_buoy_data:
         return {
             'dHs_dt': 0.0,
             'dTp_dt': 0.0,
@@ -42,12 +97,10 @@ def calculate_swell_trends(historical_buoy_data, hours=24):
             'Tp_change': 0.0,
             'trend_classification': 'unknown'
         }
+    else:
+        history = BuoyHistory.from_dict(historical_buoy_data)
     
-    times = historical_buoy_data['times']
-    Hs_list = historical_buoy_data['Hs']
-    Tp_list = historical_buoy_data['Tp']
-    
-    if len(times) < 2:
+    if len(history) < 2:
         return {
             'dHs_dt': 0.0,
             'dTp_dt': 0.0,
@@ -56,24 +109,13 @@ def calculate_swell_trends(historical_buoy_data, hours=24):
             'trend_classification': 'insufficient_data'
         }
     
-    # Filter to last N hours
-    now = datetime.now()
-    cutoff_time = now - timedelta(hours=hours)
+    # Filter to last N hours in one vectorized pass
+    cutoff_time = np.datetime64(datetime.now() - timedelta(hours=hours), 'us')
+    recent = history.t >= cutoff_time
     
-    recent_times = []
-    recent_Hs = []
-    recent_Tp = []
-    
-    for i, time in enumerate(times):
-        if isinstance(time, str):
-            time_obj = datetime.fromisoformat(time.replace('Z', '+00:00'))
-        else:
-            time_obj = time
-        
-        if time_obj >= cutoff_time:
-            recent_times.append(time_obj)
-            recent_Hs.append(Hs_list[i] if i < len(Hs_list) else Hs_list[-1])
-            recent_Tp.append(Tp_list[i] if i < len(Tp_list) else Tp_list[-1])
+    recent_times = history.t[recent]
+    Hs_array = history.Hs[recent]
+    Tp_array = history.Tp[recent]
     
     if len(recent_times) < 2:
         return {
@@ -86,16 +128,18 @@ def calculate_swell_trends(historical_buoy_data, hours=24):
     
     # Calculate trends
     # Use linear regression for trend
-    time_numeric = np.array([(t - recent_times[0]).total_seconds() / 3600.0 for t in recent_times])
+    time_numeric = (recent_times - recent_times[0]) / np.timedelta64(1, 'h')  # Float hours
     
     # Linear fit: Hs = a + b*t
-    Hs_array = np.array(recent_Hs)
-    Tp_array = np.array(recent_Tp)
+    # Least-squares slope: b = sum((t - t_mean) * (y - y_mean)) / sum((t - t_mean)^2),
+    # with the centered times shared by both fits
+    t_centered = time_numeric - time_numeric.mean()
+    t_ss = np.dot(t_centered, t_centered)
     
-    if len(time_numeric) > 1 and np.std(time_numeric) > 0:
+    if len(time_numeric) > 1 and t_ss > 0:
         # Linear regression
-        Hs_trend = np.polyfit(time_numeric, Hs_array, 1)[0]  # Slope (m/hour)
-        Tp_trend = np.polyfit(time_numeric, Tp_array, 1)[0]  # Slope (s/hour)
+        Hs_trend = np.dot(t_centered, Hs_array - Hs_array.mean()) / t_ss  # Slope (m/hour)
+        Tp_trend = np.dot(t_centered, Tp_array - Tp_array.mean()) / t_ss  # Slope (s/hour)
     else:
         Hs_trend = 0.0
         Tp_trend = 0.0
@@ -153,6 +197,19 @@ def classify_swell_trend(trend_data):
         return 'complex'
 
 
+# Score adjustment keyed on (trend class, period band, rate band); other keys = 0.0
+# Period bands: 0 = T < 8 s, 1 = 8-10 s, 2 = T >= 10 s
+# Rate bands:   0 = |dHs/dt| < 0.05, 1 = 0.05-0.1, 2 = > 0.1 m/hour
+_TREND_ADJUSTMENTS = {
+    **{('falling', p, r): -0.2 for p in range(3) for r in range(3)},  # Falling swell
+    ('falling', 2, 0): 0.3,  # Clean easing long-period swell
+    ('rising', 0, 2): -0.5,  # Rapidly rising short-period = junky windswell
+    ('rising', 2, 0): 0.2,   # Rising groundswell
+    ('rising', 2, 1): 0.2,
+    ('rising', 2, 2): 0.2,
+}
+
+
 def apply_trend_factor(surf_score, trend_data, period_s):
     """
     Apply trend factor to adjust surf score.
@@ -179,22 +236,12 @@ def apply_trend_factor(surf_score, trend_data, period_s):
     trend_class = trend_data.get('trend_classification', 'steady')
     dHs_dt = trend_data.get('dHs_dt', 0.0)
     
-    # Base adjustment
-    adjustment = 0.0
-    
-    if trend_class == 'rising':
-        # Rapidly rising short-period = bad
-        if period_s < 8.0 and abs(dHs_dt) > 0.1:
-            adjustment = -0.5  # Penalty for junky windswell
-        elif period_s >= 10.0:
-            adjustment = 0.2  # Bonus for rising groundswell
-    elif trend_class == 'falling':
-        # Slowly easing long-period = good (clean conditions)
-        if period_s >= 10.0 and abs(dHs_dt) < 0.05:
-            adjustment = 0.3  # Bonus for clean easing swell
-        else:
-            adjustment = -0.2  # Penalty for falling swell
-    # 'steady' = no adjustment
+    rate = abs(dHs_dt)
+    period_band = 0 if period_s < 8.0 else (2 if period_s >= 10.0 else 1)
+    rate_band = 2 if rate > 0.1 else (0 if rate < 0.05 else 1)
+    
+    # 'steady' (and unknown classes) = no adjustment
+    adjustment = _TREND_ADJUSTMENTS.get((trend_class, period_band, rate_band), 0.0)
     
     # Apply adjustment
     adjusted_score = surf_score + adjustment
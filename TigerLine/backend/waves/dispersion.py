@@ -12,9 +12,18 @@ where:
     g = 9.81 m/s^2
 """
 
+import math
+from functools import lru_cache
+
 import numpy as np
 from scipy.optimize import fsolve
 
+# Optional JIT compiler for the scalar Newton kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 # Gravitational acceleration (m/s^2)
 G = 9.81
@@ -22,6 +31,21 @@ G = 9.81
 # Water density (kg/m^3)
 RHO_WATER = 1025.0
 
+# Dispersion results are memoized on (T, h). Periods are bucketed to 0.1 ms
+# (buoy periods come from a small discrete set); depths are used exactly, since
+# profile and buoy depths repeat exactly and rounding them would distort k in
+# very shallow water. If G is ever changed at runtime, call
+# clear_dispersion_cache().
+PERIOD_DECIMALS = 4
+
+# k*h above which water is treated as deep (cg = c / 2)
+DEEP_WATER_KH = 10.0
+
+
+def _quantize(T, h):
+    """Bucket (T, h) to the memoization resolution (also unwraps 0-d arrays)."""
+    return round(float(T), PERIOD_DECIMALS), float(h)
+
 
 def solve_dispersion(T, h, tol=1e-6):
     """
@@ -37,54 +61,77 @@ def solve_dispersion(T, h, tol=1e-6):
     - Shallow water (k*h << 1): tanh(k*h) ≈ k*h
       omega^2 ≈ g * k^2 * h, so phase speed c ≈ sqrt(g*h), independent of frequency
     
+    Array inputs (broadcast together) are solved in one batch over the whole
+    array instead of one scalar solve per point, using an explicit initial
+    guess refined by a fixed number of Halley steps (see
+    _solve_dispersion_array).
+    
     Parameters:
     -----------
-    T : float
+    T : float or array_like
         Wave period (s)
-    h : float
+    h : float or array_like
         Water depth (m)
     tol : float
         Convergence tolerance
         
     Returns:
     --------
-    k : float
-        Wavenumber (1/m)
+    k : float or np.ndarray
+        Wavenumber (1/m); an array if T or h is an array
     """
+    if np.ndim(T) or np.ndim(h):
+        return _solve_dispersion_array(T, h, tol)
+    
+    T, h = _quantize(T, h)
+    
     if T <= 0:
         return 0.0
     
     if h <= 0:
         return 0.0
     
-    omega = 2.0 * np.pi / T
+    return _solve_dispersion_cached(T, h, tol)
+
+
+@lru_cache(maxsize=4096)
+def _solve_dispersion_cached(T, h, tol):
+    """Newton-Raphson solve for k, memoized on bucketed (T, h) - see solve_dispersion."""
+    omega = 2.0 * math.pi / T
+    omega2 = omega * omega
     
     # Deep water initial guess
-    k0 = omega**2 / G
+    k0 = omega2 / G
     
     # For very deep water, use deep water approximation
     if h > 1000:  # Effectively infinite depth
         return k0
     
-    # Define function to solve: f(k) = omega^2 - g*k*tanh(k*h) = 0
-    def f(k):
-        return omega**2 - G * k * np.tanh(k * h)
-    
-    # Derivative: df/dk = -g*tanh(k*h) - g*k*h*sech^2(k*h)
-    def df(k):
-        kh = k * h
-        return -G * np.tanh(kh) - G * k * h * (1.0 / np.cosh(kh))**2
+    return _newton_k(omega2, h, k0, tol, G)
+
+
+def _newton_k(omega2, h, k0, tol, g):
+    """
+    Newton-Raphson kernel for k, starting from the deep-water guess k0.
     
-    # Newton-Raphson iteration
+    Pure scalar math so it can be compiled with numba when available; g is
+    passed in rather than read from the module so a compiled kernel does not
+    freeze its value.
+    """
+    # Newton-Raphson on f(k) = omega^2 - g*k*tanh(k*h) = 0, with
+    # df/dk = -g*tanh(k*h) - g*k*h*sech^2(k*h) and sech^2 = 1 - tanh^2,
+    # so each iteration needs a single scalar tanh
     k = k0
     max_iter = 100
     
     for _ in range(max_iter):
-        f_val = f(k)
+        kh = k * h
+        t = math.tanh(kh)
+        f_val = omega2 - g * k * t
         if abs(f_val) < tol:
             break
         
-        df_val = df(k)
+        df_val = -g * t - g * kh * (1.0 - t * t)
         if abs(df_val) < 1e-10:  # Avoid division by zero
             break
         
@@ -103,34 +150,157 @@ def solve_dispersion(T, h, tol=1e-6):
     return k
 
 
-def phase_speed(T, h):
+if njit is not None:
+    _newton_k = njit(cache=True)(_newton_k)
+    _newton_k(0.4, 10.0, 0.04, 1e-6, G)  # Compile once at import
+
+
+def _solve_dispersion_array(T, h, tol):
     """
-    Compute phase speed from period and depth.
+    Batched solve for k over broadcast arrays of T and h.
     
-    Phase speed: c = omega / k
+    Starts from the Fenton & McKee (1990) explicit approximation
+        k*h ≈ k0*h * coth((k0*h)^(3/4))^(2/3),  k0 = omega^2 / g
+    (within ~2% everywhere) and applies a fixed two Halley steps, which
+    brings k to machine precision without a data-dependent convergence
+    test. tol is accepted for signature compatibility and not needed here.
+    """
+    T, h = np.broadcast_arrays(np.asarray(T, dtype=np.float64), np.asarray(h, dtype=np.float64))
+    
+    # Solve on placeholder values where T or h is non-positive, zero them at the end
+    valid = (T > 0) & (h > 0)
+    T = np.where(valid, T, 1.0)
+    h = np.where(valid, h, 1.0)
+    
+    omega2 = (2.0 * np.pi / T)**2
+    
+    # Fenton-McKee initial guess (alpha^2 = k0*h); exact k0 in deep water
+    alpha2 = omega2 * h / G
+    k = alpha2 * np.tanh(alpha2**0.75)**(-2.0 / 3.0) / h
+    
+    for _ in range(2):
+        kh = k * h
+        t = np.tanh(kh)
+        sech2 = 1.0 - t * t
+        f = omega2 - G * k * t
+        df = -G * t - G * kh * sech2
+        ddf = 2.0 * G * h * sech2 * (kh * t - 1.0)
+        
+        # Halley update
+        k = k - 2.0 * f * df / (2.0 * df * df - f * ddf)
+    
+    return np.where(valid, k, 0.0)
+
+
+def compute_kinematics(T, h):
+    """
+    Compute wavenumber, phase speed and group velocity in one pass.
+    
+    Solves the dispersion relation once and derives both speeds from the
+    shared k and k*h:
+        c  = omega / k
+        cg = 0.5 * c * (1 + (2 * k * h) / sinh(2 * k * h))
+    
+    with cg = 0.5 * c in deep water (k*h > 10) and cg = c in shallow water
+    (k*h < 0.1).
     
     Parameters:
     -----------
-    T : float
+    T : float or array_like
         Wave period (s)
-    h : float
+    h : float or array_like
         Water depth (m)
         
     Returns:
     --------
-    c : float
+    k : float or np.ndarray
+        Wavenumber (1/m)
+    c : float or np.ndarray
         Phase speed (m/s)
+    cg : float or np.ndarray
+        Group velocity (m/s)
     """
+    if np.ndim(T) or np.ndim(h):
+        return _kinematics_array(T, h)
+    
+    T, h = _quantize(T, h)
+    
     if T <= 0:
-        return 0.0
+        return 0.0, 0.0, 0.0
+    
+    # Deep water: for k0*h > 10, tanh(k*h) = 1 to within 4e-9, so the
+    # analytic deep-water values are exact at solver tolerance - skip the solve
+    omega = 2.0 * math.pi / T
+    k_deep = omega * omega / G
+    if k_deep * h > DEEP_WATER_KH:
+        c_deep = G * T / (2.0 * math.pi)
+        return k_deep, c_deep, 0.5 * c_deep
     
-    omega = 2.0 * np.pi / T
+    return _kinematics_cached(T, h)
+
+
+@lru_cache(maxsize=4096)
+def _kinematics_cached(T, h):
+    """Scalar (k, c, cg) memoized on bucketed (T, h) - see compute_kinematics."""
     k = solve_dispersion(T, h)
     
     if k <= 0:
-        return 0.0
+        return k, 0.0, 0.0
     
-    return omega / k
+    c = 2.0 * np.pi / T / k
+    kh = k * h
+    
+    # Deep water approximation
+    if kh > DEEP_WATER_KH:
+        return k, c, 0.5 * c
+    
+    # Shallow water approximation
+    if kh < 0.1:
+        return k, c, c
+    
+    # Full expression
+    cg = 0.5 * c * (1.0 + (2 * kh) / np.sinh(2 * kh))
+    
+    return k, c, cg
+
+
+def _kinematics_array(T, h):
+    """Batched (k, c, cg) over broadcast arrays of T and h."""
+    T, h = np.broadcast_arrays(np.asarray(T, dtype=np.float64), np.asarray(h, dtype=np.float64))
+    k = _solve_dispersion_array(T, h, 1e-6)
+    
+    solved = k > 0
+    c = np.where(solved, 2.0 * np.pi / np.where(solved, T, 1.0) / np.where(solved, k, 1.0), 0.0)
+    
+    # Group/phase speed ratio, evaluated on k*h clipped to where the full
+    # expression applies, with the deep/shallow limits outside it
+    kh = k * h
+    kh_mid = np.clip(kh, 0.1, DEEP_WATER_KH)
+    n = 0.5 * (1.0 + (2 * kh_mid) / np.sinh(2 * kh_mid))
+    n = np.where(kh > DEEP_WATER_KH, 0.5, np.where(kh < 0.1, 1.0, n))
+    
+    return k, c, n * c
+
+
+def phase_speed(T, h):
+    """
+    Compute phase speed from period and depth.
+    
+    Phase speed: c = omega / k
+    
+    Parameters:
+    -----------
+    T : float or array_like
+        Wave period (s)
+    h : float or array_like
+        Water depth (m)
+        
+    Returns:
+    --------
+    c : float or np.ndarray
+        Phase speed (m/s)
+    """
+    return compute_kinematics(T, h)[1]
 
 
 def group_speed(T, h):
@@ -146,43 +316,23 @@ def group_speed(T, h):
     
     Parameters:
     -----------
-    T : float
+    T : float or array_like
         Wave period (s)
-    h : float
+    h : float or array_like
         Water depth (m)
         
     Returns:
     --------
-    cg : float
+    cg : float or np.ndarray
         Group velocity (m/s)
     """
-    if T <= 0:
-        return 0.0
-    
-    c = phase_speed(T, h)
-    k = solve_dispersion(T, h)
-    
-    if k <= 0 or h <= 0:
-        return c
-    
-    kh = k * h
-    
-    # Deep water approximation
-    if kh > 10:
-        return 0.5 * c
-    
-    # Shallow water approximation
-    if kh < 0.1:
-        return c
-    
-    # Full expression
-    sinh_2kh = np.sinh(2 * kh)
-    if sinh_2kh > 0:
-        cg = 0.5 * c * (1.0 + (2 * kh) / sinh_2kh)
-    else:
-        cg = c
-    
-    return cg
+    return compute_kinematics(T, h)[2]
+
+
+def clear_dispersion_cache():
+    """Drop all memoized dispersion and kinematics results."""
+    _solve_dispersion_cached.cache_clear()
+    _kinematics_cached.cache_clear()
 
 
 def wave_energy(H, rho=RHO_WATER):
@@ -238,6 +388,6 @@ def energy_flux(H, T, h, theta=0.0):
         Energy flux (W/m)
     """
     E = wave_energy(H)
-    cg = group_speed(T, h)
+    _, _, cg = compute_kinematics(T, h)
     return E * cg * np.cos(theta)
 
@@ -14,10 +14,13 @@ Physics:
 - Combined: Hs_total = sqrt(Hs_swell^2 + Hs_wind^2)
 """
 
+import math
+
 import numpy as np
 from datetime import datetime, timedelta
 import logging
 from . import dispersion
+from .stats import angle_between_vec
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +59,8 @@ def calculate_travel_time(distance_km, period_s, depth_m=25.0):
     if period_s <= 0:
         return 0.0
     
-    # Calculate group velocity
+    # Calculate group velocity (memoized on (T, h) in dispersion, so repeated
+    # calls from forecast loops are a cache lookup; see clear_dispersion_cache)
     cg = dispersion.group_speed(period_s, depth_m)
     
     if cg <= 0:
@@ -105,7 +109,7 @@ def propagate_wave_height(Hs_initial, time_hours, decay_rate=None, tau_hours=Non
         return Hs_initial
     
     # Exponential decay
-    Hs_decayed = Hs_initial * np.exp(-time_hours / tau_hours)
+    Hs_decayed = Hs_initial * math.exp(-time_hours / tau_hours)
     
     # Ensure non-negative
     return max(0.0, Hs_decayed)
@@ -144,9 +148,7 @@ def add_wind_wave_component(Hs_swell, wind_speed_ms, wind_dir_deg, swell_dir_deg
         fetch_km = WIND_WAVE_FETCH_KM
     
     # Calculate angle between wind and swell
-    angle_diff = abs(wind_dir_deg - swell_dir_deg) % 360
-    if angle_diff > 180:
-        angle_diff = 360 - angle_diff
+    angle_diff = angle_between_vec(wind_dir_deg, swell_dir_deg, degrees=True)
     
     # Wind wave generation is most effective when:
     # - Wind speed > minimum threshold
@@ -177,11 +179,93 @@ def add_wind_wave_component(Hs_swell, wind_speed_ms, wind_dir_deg, swell_dir_deg
     Hs_wind = min(Hs_wind, 2.0)  # Max ~2m wind waves
     
     # Combined height (energy addition)
-    Hs_total = np.sqrt(Hs_swell**2 + Hs_wind**2)
+    Hs_total = math.sqrt(Hs_swell * Hs_swell + Hs_wind * Hs_wind)
+    
+    return Hs_total, Hs_wind
+
+
+def add_wind_wave_component_vec(Hs_swell, wind_speed_ms, wind_dir_deg, swell_dir_deg):
+    """
+    Estimate wind wave contribution for arrays of conditions.
+    
+    Branchless array form of add_wind_wave_component(): the alignment
+    reduction is selected with np.where and calm-wind entries are zeroed
+    with a mask, so whole wind time series are evaluated at once.
+    
+    Parameters:
+    -----------
+    Hs_swell : array_like
+        Swell wave height (m)
+    wind_speed_ms : array_like
+        Wind speed (m/s)
+    wind_dir_deg : array_like
+        Wind direction (degrees, coming-FROM)
+    swell_dir_deg : array_like
+        Swell direction (degrees, coming-FROM)
+    
+    Returns:
+    --------
+    Hs_total : np.ndarray
+        Combined swell + wind wave height (m)
+    Hs_wind : np.ndarray
+        Wind wave component (m)
+    """
+    Hs_swell = np.asarray(Hs_swell, dtype=np.float64)
+    wind_speed_ms = np.asarray(wind_speed_ms, dtype=np.float64)
+    
+    angle_diff = angle_between_vec(wind_dir_deg, swell_dir_deg, degrees=True)
+    
+    # Full generation within 45 degrees, 0.6 up to 90, 0.3 beyond
+    multiplier = np.where(angle_diff > 90, 0.3, np.where(angle_diff > 45, 0.6, 1.0))
+    Hs_wind = np.minimum(0.008 * wind_speed_ms**2 * multiplier, 2.0)
+    
+    calm = wind_speed_ms < WIND_WAVE_MIN_SPEED_MS
+    Hs_wind = np.where(calm, 0.0, Hs_wind)
+    Hs_total = np.where(calm, Hs_swell, np.sqrt(Hs_swell**2 + Hs_wind**2))
     
     return Hs_total, Hs_wind
 
 
+def _to_epoch_seconds(times):
+    """Seconds since the Unix epoch for datetime(s) or ISO string(s), in one NumPy pass."""
+    return np.asarray(times, dtype='datetime64[us]').astype(np.int64) / 1e6
+
+
+def _prepare_history(historical_data):
+    """
+    Convert a history dict to the arrays used for interpolation.
+    
+    The result is memoized on the dict under '_prepared', so the history lists
+    must not be modified in place after the first call.
+    
+    Parameters:
+    -----------
+    historical_data : dict
+        Historical data with keys: 'times', 'Hs', 'Tp', 'peak_direction'
+    
+    Returns:
+    --------
+    prepared : tuple of np.ndarray
+        (times_numeric, Hs, Tp, dir_x, dir_y) - epoch seconds, and the
+        direction as east/north components weighted by Hs^2 (energy)
+    """
+    prepared = historical_data.get('_prepared')
+    if prepared is None:
+        dir_list = historical_data.get('peak_direction', historical_data.get('mean_direction', [90.0]))
+        dir_rad = np.deg2rad(dir_list)
+        Hs_arr = np.asarray(historical_data['Hs'], dtype=np.float64)
+        energy = Hs_arr**2
+        prepared = (
+            _to_epoch_seconds(historical_data['times']),
+            Hs_arr,
+            np.asarray(historical_data['Tp'], dtype=np.float64),
+            energy * np.sin(dir_rad),
+            energy * np.cos(dir_rad),
+        )
+        historical_data['_prepared'] = prepared
+    return prepared
+
+
 def interpolate_historical_data(historical_data, target_time):
     """
     Interpolate historical buoy data to a specific time.
@@ -213,9 +297,9 @@ def interpolate_historical_data(historical_data, target_time):
     if not times:
         return {'Hs': 1.5, 'Tp': 10.0, 'peak_direction': 90.0}
     
-    # Convert times to numeric for interpolation
-    times_numeric = np.array([(t - datetime(1970, 1, 1)).total_seconds() for t in times])
-    target_numeric = (target_time - datetime(1970, 1, 1)).total_seconds()
+    # Numeric times and direction components, converted once per history
+    times_numeric, Hs_arr, Tp_arr, dir_x, dir_y = _prepare_history(historical_data)
+    target_numeric = float(_to_epoch_seconds(target_time))
     
     # Handle edge cases
     if target_numeric <= times_numeric[0]:
@@ -223,17 +307,25 @@ def interpolate_historical_data(historical_data, target_time):
     if target_numeric >= times_numeric[-1]:
         return {'Hs': Hs_list[-1], 'Tp': Tp_list[-1], 'peak_direction': dir_list[-1]}
     
-    # Linear interpolation
-    Hs_interp = np.interp(target_numeric, times_numeric, Hs_list)
-    Tp_interp = np.interp(target_numeric, times_numeric, Tp_list)
+    # Linear interpolation between the bracketing samples, found with a
+    # single binary search shared by all fields (same arithmetic as np.interp)
+    i1 = int(np.searchsorted(times_numeric, target_numeric, side='right'))
+    i0 = i1 - 1
+    dt = times_numeric[i1] - times_numeric[i0]
+    dx = target_numeric - times_numeric[i0]
     
-    # Circular interpolation for direction
-    dir_rad = np.deg2rad(dir_list)
-    dir_complex = np.exp(1j * dir_rad)
-    real_interp = np.interp(target_numeric, times_numeric, np.real(dir_complex))
-    imag_interp = np.interp(target_numeric, times_numeric, np.imag(dir_complex))
-    dir_interp_rad = np.angle(real_interp + 1j * imag_interp)
-    dir_interp = np.rad2deg(dir_interp_rad) % 360
+    def lerp(values):
+        return (values[i1] - values[i0]) / dt * dx + values[i0]
+    
+    Hs_interp = lerp(Hs_arr)
+    Tp_interp = lerp(Tp_arr)
+    
+    # Circular interpolation for direction on energy-weighted vectors, so
+    # the more energetic sample dominates and opposing directions do not
+    # collapse to an arbitrary angle
+    x_interp = lerp(dir_x)
+    y_interp = lerp(dir_y)
+    dir_interp = np.rad2deg(np.arctan2(x_interp, y_interp)) % 360
     
     return {
         'Hs': float(Hs_interp),
@@ -242,7 +334,7 @@ def interpolate_historical_data(historical_data, target_time):
     }
 
 
-def forecast_wave_conditions(historical_data, forecast_time, wind_data=None, buoy_distance_km=None):
+def forecast_wave_conditions(historical_data, forecast_time, wind_data=None, buoy_distance_km=None, now=None):
     """
     Forecast wave conditions at beach for a specific future time.
     
@@ -262,6 +354,9 @@ def forecast_wave_conditions(historical_data, forecast_time, wind_data=None, buo
         Wind data with 'speed_ms' and 'direction_deg' for forecast_time
     buoy_distance_km : float, optional
         Distance from buoy to beach (km), default BUOY_TO_BEACH_DISTANCE_KM
+    now : datetime, optional
+        Time of the current buoy reading, default datetime.now(); pass one
+        value to keep a series of forecasts consistent
     
     Returns:
     --------
@@ -295,7 +390,9 @@ def forecast_wave_conditions(historical_data, forecast_time, wind_data=None, buo
     # ALWAYS use most recent buoy data for current conditions
     # The "propagation" model was looking back in time and finding old high waves
     # For a real forecast, use CURRENT buoy reading
-    buoy_conditions = interpolate_historical_data(historical_data, datetime.now())
+    if now is None:
+        now = datetime.now()
+    buoy_conditions = interpolate_historical_data(historical_data, now)
     
     # Calculate travel time for reference (but don't use it to look backwards)
     travel_time = 0.0  # Minimal delay for current conditions
@@ -337,3 +434,68 @@ def forecast_wave_conditions(historical_data, forecast_time, wind_data=None, buo
         'Hs_wind': float(Hs_wind)
     }
 
+
+def forecast_wave_conditions_batch(historical_data, forecast_times, wind_speeds=None, wind_dirs=None,
+                                   buoy_distance_km=None, dtype=np.float64, now=None):
+    """
+    Forecast wave conditions at beach for a series of forecast times.
+    
+    Batched equivalent of calling forecast_wave_conditions() once per time.
+    The buoy reading, travel time and decay do not depend on the forecast
+    time (the model uses the current buoy reading), so they are computed
+    once; the wind wave component is evaluated for all times with
+    add_wind_wave_component_vec().
+    
+    Parameters:
+    -----------
+    historical_data : dict
+        Historical buoy data with 'times', 'Hs', 'Tp', 'peak_direction'
+    forecast_times : list of datetime
+        Future times to forecast (when waves arrive at beach)
+    wind_speeds : array_like, optional
+        Wind speed (m/s) at each forecast time
+    wind_dirs : array_like, optional
+        Wind direction (degrees, coming-FROM) at each forecast time
+    buoy_distance_km : float, optional
+        Distance from buoy to beach (km), default BUOY_TO_BEACH_DISTANCE_KM
+    dtype : np.dtype
+        dtype of the returned arrays. Computation is always float64;
+        np.float32 halves the memory of large batches that are kept as
+        arrays, but adds float32 noise when values are converted to float
+    now : datetime, optional
+        Time of the current buoy reading, default datetime.now()
+    
+    Returns:
+    --------
+    dict of np.ndarray, one value per forecast time, with the same keys as
+    forecast_wave_conditions()
+    """
+    if buoy_distance_km is None:
+        buoy_distance_km = BUOY_TO_BEACH_DISTANCE_KM
+    
+    n = len(forecast_times)
+    
+    if now is None:
+        now = datetime.now()
+    buoy_conditions = interpolate_historical_data(historical_data, now)
+    Tp_initial = float(buoy_conditions['Tp'])
+    dir_initial = float(buoy_conditions['peak_direction'])
+    
+    travel_time = calculate_travel_time(buoy_distance_km, Tp_initial)
+    Hs_swell = np.full(n, float(propagate_wave_height(buoy_conditions['Hs'], travel_time)))
+    
+    if wind_speeds is not None:
+        wind_dir = wind_dirs if wind_dirs is not None else 0.0
+        Hs_forecast, Hs_wind = add_wind_wave_component_vec(Hs_swell, wind_speeds, wind_dir, dir_initial)
+    else:
+        Hs_forecast = Hs_swell
+        Hs_wind = np.zeros(n)
+    
+    return {
+        'Hs': Hs_forecast.astype(dtype, copy=False),
+        'Tp': np.full(n, Tp_initial, dtype=dtype),
+        'peak_direction': np.full(n, dir_initial, dtype=dtype),
+        'travel_time_hours': np.full(n, float(travel_time), dtype=dtype),
+        'Hs_swell': Hs_swell.astype(dtype, copy=False),
+        'Hs_wind': Hs_wind.astype(dtype, copy=False)
+    }
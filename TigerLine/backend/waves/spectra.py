@@ -18,6 +18,8 @@ Under this linear random-phase model, eta(t) is approximately a Gaussian
 (normal) process with mean close to 0.
 """
 
+import math
+
 import numpy as np
 
 
@@ -37,9 +39,14 @@ def compute_mean_std(eta_t):
     sigma : float
         Standard deviation of eta(t)
     """
-    eta_t = np.asarray(eta_t)
-    mu = np.mean(eta_t)
-    sigma = np.std(eta_t, ddof=0)  # Population std dev
+    eta_t = np.asarray(eta_t).ravel()
+    
+    # Mean accumulated in float64 (also for float32 records), then the
+    # population std dev from the deviations - np.std would recompute the
+    # mean in a pass of its own
+    mu = eta_t.mean(dtype=np.float64)
+    deviation = eta_t - mu
+    sigma = math.sqrt(np.dot(deviation, deviation) / eta_t.size)
     return mu, sigma
 
 
@@ -71,15 +78,73 @@ def compute_spectral_moments(frequencies, S):
     f = np.asarray(frequencies)
     S = np.asarray(S)
     
-    # Integrate using trapezoidal rule
-    m0 = np.trapz(S, f)
-    m1 = np.trapz(f * S, f)
+    # Integrate using trapezoidal rule, with the weights computed once for
+    # all three moments
+    Sw = S * _trap_weights(f)
+    m0 = Sw.sum()
+    m1 = np.dot(f, Sw)
     
     # For m_1, avoid division by zero at f=0
     # Use S/f where f > 0, otherwise 0
     mask = f > 0
     if np.any(mask):
-        m_1 = np.trapz(np.where(mask, S / f, 0), f)
+        m_1 = np.sum(Sw[mask] / f[mask])
+    else:
+        m_1 = 0.0
+    
+    return m0, m1, m_1
+
+
+def _trap_weights(f):
+    """Trapezoidal-rule weights for grid f, so that w @ y integrates y over f."""
+    half_df = 0.5 * np.diff(f)
+    w = np.zeros(len(f))
+    w[:-1] += half_df
+    w[1:] += half_df
+    return w
+
+
+def compute_spectral_moments_grid(S, df, f_min=0.0):
+    """
+    Compute spectral moments m0, m1, and m_1 on a uniform frequency grid.
+    
+    Same as compute_spectral_moments() for frequencies f = f_min + i * df,
+    where the trapezoidal rule reduces to df * (sum - half the end points).
+    
+    Parameters:
+    -----------
+    S : array-like
+        Spectral density S(f) (m^2/Hz)
+    df : float
+        Frequency spacing (Hz)
+    f_min : float
+        First frequency of the grid (Hz), default 0.0
+        
+    Returns:
+    --------
+    m0 : float
+        Zeroth moment (variance)
+    m1 : float
+        First moment
+    m_1 : float
+        Negative first moment
+    """
+    S = np.asarray(S, dtype=np.float64)
+    
+    if len(S) < 2:
+        return 0.0, 0.0, 0.0
+    
+    f = f_min + df * np.arange(len(S))
+    
+    def trapz_uniform(y):
+        return df * (y.sum() - 0.5 * (y[0] + y[-1]))
+    
+    m0 = trapz_uniform(S)
+    m1 = trapz_uniform(f * S)
+    
+    mask = f > 0
+    if np.any(mask):
+        m_1 = trapz_uniform(np.divide(S, f, out=np.zeros_like(S), where=mask))
     else:
         m_1 = 0.0
     
@@ -104,7 +169,7 @@ def significant_wave_height_spectral(m0):
     """
     if m0 < 0:
         return 0.0
-    return 4.0 * np.sqrt(m0)
+    return 4.0 * math.sqrt(m0)
 
 
 def significant_wave_height_time(eta_t):
@@ -183,18 +248,22 @@ def peak_period(frequencies, S):
     Returns:
     --------
     Tp : float
-        Peak period (s)
+        Peak period (s), 0.0 if S has no positive values
     fp : float
-        Peak frequency (Hz)
+        Peak frequency (Hz), 0.0 if S has no positive values
     """
     f = np.asarray(frequencies)
     S = np.asarray(S)
     
-    if len(f) == 0 or np.all(S == 0):
+    if len(f) == 0:
         return 0.0, 0.0
     
-    idx_max = np.argmax(S)
-    fp = f[idx_max]
+    # One pass over S: a spectrum with no positive energy has no peak
+    idx_max = int(np.argmax(S))
+    if S[idx_max] <= 0:
+        return 0.0, 0.0
+    
+    fp = float(f[idx_max])
     
     if fp > 0:
         Tp = 1.0 / fp
@@ -224,7 +293,7 @@ def H_rms_from_sigma(sigma):
     return np.sqrt(8.0) * sigma
 
 
-def rayleigh_distribution(H, H_rms):
+def rayleigh_distribution(H, H_rms, out=None):
     """
     Compute Rayleigh distribution for wave heights.
     
@@ -243,6 +312,8 @@ def rayleigh_distribution(H, H_rms):
         Wave height(s) (m)
     H_rms : float
         Root-mean-square wave height (m)
+    out : tuple of np.ndarray, optional
+        (pdf, exceedance) arrays shaped like H to write the results into
         
     Returns:
     --------
@@ -252,19 +323,33 @@ def rayleigh_distribution(H, H_rms):
         Exceedance probability P(H > H0)
     """
     H = np.asarray(H)
-    H_rms = np.asarray(H_rms)
+    H_rms = float(H_rms)  # Scalar: 0-d array arithmetic is ~10x slower
     
     if H_rms <= 0:
+        if out is not None:
+            out[0].fill(0.0)
+            out[1].fill(1.0)
+            return out
         return np.zeros_like(H), np.ones_like(H)
     
     # Avoid division by zero
     H_safe = np.maximum(H, 0)
-    
-    # Probability density
-    pdf = (H_safe / (H_rms**2)) * np.exp(-(H_safe**2) / (2 * H_rms**2))
-    
-    # Exceedance probability
-    exceedance = np.exp(-(H_safe**2) / (2 * H_rms**2))
-    
+    # Scalar factors hoisted so each array element sees only multiplies
+    inv_Hrms2 = 1.0 / (H_rms * H_rms)
+    exp_scale = -0.5 * inv_Hrms2
+    
+    if out is None:
+        # Exceedance probability, shared by the density: p(H) = H / H_rms^2 * P(H)
+        exceedance = np.exp(H_safe * H_safe * exp_scale)
+        pdf = H_safe * inv_Hrms2 * exceedance
+        return pdf, exceedance
+    
+    # Same computation written into the caller's arrays
+    pdf, exceedance = out
+    np.multiply(H_safe, H_safe, out=exceedance)
+    exceedance *= exp_scale
+    np.exp(exceedance, out=exceedance)
+    np.multiply(H_safe, inv_Hrms2, out=pdf)
+    pdf *= exceedance
     return pdf, exceedance
 
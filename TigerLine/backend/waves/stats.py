@@ -35,6 +35,29 @@ def normalize_angle(angle, degrees=False):
     return normalized
 
 
+def normalize_angle_vec(angle, degrees=False):
+    """
+    Normalize angles to (-pi, pi] or (-180, 180] range without branching.
+    
+    Array counterpart of normalize_angle(), using the same half-open range.
+    
+    Parameters:
+    -----------
+    angle : float or array_like
+        Angle(s) to normalize
+    degrees : bool
+        If True, treat as degrees; if False, treat as radians
+        
+    Returns:
+    --------
+    normalized : float or np.ndarray
+        Normalized angle(s)
+    """
+    period = 360.0 if degrees else 2.0 * np.pi
+    half_period = 0.5 * period
+    return half_period - (half_period - np.asarray(angle)) % period
+
+
 def angle_between(dir1, dir2, degrees=False):
     """
     Compute smallest angle between two directions.
@@ -56,3 +79,25 @@ def angle_between(dir1, dir2, degrees=False):
     diff = normalize_angle(dir2 - dir1, degrees=degrees)
     return abs(diff)
 
+
+def angle_between_vec(dir1, dir2, degrees=False):
+    """
+    Compute smallest angle between two directions, elementwise.
+    
+    Array counterpart of angle_between().
+    
+    Parameters:
+    -----------
+    dir1 : float or array_like
+        First direction(s)
+    dir2 : float or array_like
+        Second direction(s)
+    degrees : bool
+        If True, treat as degrees; if False, treat as radians
+        
+    Returns:
+    --------
+    angle : float or np.ndarray
+        Smallest angle(s) between directions
+    """
+    return np.abs(normalize_angle_vec(np.subtract(dir2, dir1), degrees=degrees))
@@ -17,8 +17,22 @@ For ocean-scale surf waves:
 - Depth-limited breaking criterion Hb ≈ gamma_b * h is reasonable for surf forecasting
 """
 
+import math
+
 import numpy as np
-from .dispersion import phase_speed, group_speed
+from .dispersion import phase_speed, group_speed, compute_kinematics
+
+# Optional JIT compiler for the sequential shoaling kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Columns of the shoaling path returned by find_breaking_point(return_path=True)
+PATH_DTYPE = np.dtype([
+    ('x', 'f8'), ('h', 'f8'), ('H', 'f8'), ('theta_rad', 'f8'), ('theta_deg', 'f8'),
+    ('c', 'f8'), ('cg', 'f8'), ('Ksr', 'f8')
+])
 
 
 def refract_direction(T, h1, h2, theta1):
@@ -34,38 +48,41 @@ def refract_direction(T, h1, h2, theta1):
     
     where theta is measured from shore-normal (theta = 0 is straight-in).
     
+    All arguments broadcast against each other.
+    
     Parameters:
     -----------
-    T : float
+    T : float or array_like
         Wave period (s)
-    h1 : float
+    h1 : float or array_like
         Depth at first location (m)
-    h2 : float
+    h2 : float or array_like
         Depth at second location (m)
-    theta1 : float
+    theta1 : float or array_like
         Wave direction at h1, measured from shore-normal (radians)
         
     Returns:
     --------
-    theta2 : float
+    theta2 : float or np.ndarray
         Wave direction at h2, measured from shore-normal (radians)
     """
     c1 = phase_speed(T, h1)
     c2 = phase_speed(T, h2)
     
-    if c1 <= 0 or c2 <= 0:
-        return theta1
-    
-    # Snell's law: sin(theta2) = sin(theta1) * c2 / c1
-    sin_theta2 = np.sin(theta1) * c2 / c1
-    
-    # Clip to valid range [-1, 1] to avoid numerical issues
-    sin_theta2 = np.clip(sin_theta2, -1.0, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Snell's law: sin(theta2) = sin(theta1) * c2 / c1
+        sin_theta2 = np.sin(theta1) * c2 / c1
+        
+        # Clip to valid range [-1, 1] to avoid numerical issues
+        sin_theta2 = np.clip(sin_theta2, -1.0, 1.0)
+        
+        theta2 = np.arcsin(sin_theta2)
     
-    theta2 = np.arcsin(sin_theta2)
+    # Direction is left unchanged where either speed is non-positive
+    theta2 = np.where((c1 > 0) & (c2 > 0), theta2, theta1)
     
     # Waves refract towards shore-normal (theta → 0) as water becomes shallower
-    return theta2
+    return theta2[()]  # Scalar for scalar inputs
 
 
 def shoal_and_refract(H1, T, h1, h2, theta1):
@@ -78,26 +95,28 @@ def shoal_and_refract(H1, T, h1, h2, theta1):
     The combined shoaling-refraction coefficient:
         Ksr = H2 / H1 = sqrt( (cg1 * cos(theta1)) / (cg2 * cos(theta2)) )
     
+    All arguments broadcast against each other.
+    
     Parameters:
     -----------
-    H1 : float
+    H1 : float or array_like
         Incident wave height at depth h1 (m)
-    T : float
+    T : float or array_like
         Wave period (s)
-    h1 : float
+    h1 : float or array_like
         Depth at first location (m)
-    h2 : float
+    h2 : float or array_like
         Depth at second location (m)
-    theta1 : float
+    theta1 : float or array_like
         Wave direction at h1, measured from shore-normal (radians)
         
     Returns:
     --------
-    H2 : float
+    H2 : float or np.ndarray
         Transformed wave height at h2 (m)
-    theta2 : float
+    theta2 : float or np.ndarray
         Refracted wave direction at h2 (radians)
-    Ksr : float
+    Ksr : float or np.ndarray
         Shoaling-refraction coefficient
     """
     # Refract direction using Snell's law
@@ -107,13 +126,14 @@ def shoal_and_refract(H1, T, h1, h2, theta1):
     cg1 = group_speed(T, h1)
     cg2 = group_speed(T, h2)
     
-    # Avoid division by zero or negative values
-    cos_theta1 = max(0.01, abs(np.cos(theta1)))  # Small minimum to avoid issues
-    cos_theta2 = max(0.01, abs(np.cos(theta2)))
+    # Avoid division by zero or negative values (fmax also maps NaN to the floor)
+    cos_theta1 = np.fmax(0.01, np.abs(np.cos(theta1)))  # Small minimum to avoid issues
+    cos_theta2 = np.fmax(0.01, np.abs(np.cos(theta2)))
     
     # Energy flux conservation
-    ratio = (cg1 * cos_theta1) / (cg2 * cos_theta2)
-    ratio = max(0.01, ratio)  # Ensure positive
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (cg1 * cos_theta1) / (cg2 * cos_theta2)
+    ratio = np.fmax(0.01, ratio)  # Ensure positive
     
     Ksr = np.sqrt(ratio)
     H2 = H1 * Ksr
@@ -204,65 +224,168 @@ def find_breaking_point(H_offshore, T, theta_offshore, profile, gamma_b=0.78, re
         Distance from shore at breaking (m)
     theta_break : float
         Wave direction at breaking (radians)
-    path : list (optional)
-        If return_path=True, list of dicts with shoaling path details:
-        [{'x': x, 'h': h, 'H': H, 'theta': theta, 'c': c, 'cg': cg, 'Ksr': Ksr}, ...]
+    path : np.ndarray (optional)
+        If return_path=True, structured array (PATH_DTYPE) with one row per
+        profile point up to breaking: fields x, h, H, theta_rad, theta_deg,
+        c, cg, Ksr. Use path_as_dicts() for the list-of-dicts form.
     """
-    profile = np.asarray(profile)
+    profile = np.asarray(profile, dtype=np.float64)
     
     if len(profile) == 0:
         if return_path:
-            return 0.0, 0.0, 0.0, 0.0, []
+            return 0.0, 0.0, 0.0, 0.0, np.empty(0, dtype=PATH_DTYPE)
         return 0.0, 0.0, 0.0, 0.0
     
-    # Start from offshore (last point in profile)
-    H = H_offshore
-    theta = theta_offshore
-    path = []
+    # Offshore -> nearshore order (profile is stored nearshore first)
+    xs = profile[::-1, 0]
+    hs = profile[::-1, 1]
+    
+    if njit is not None and not return_path:
+        # Compiled sequential loop that stops at the breaking point
+        _, c, cg = compute_kinematics(T, hs)
+        i_break, H, theta = _shoal_to_break(float(H_offshore), float(theta_offshore),
+                                            c, cg, hs, float(gamma_b))
+        if i_break < 0:
+            return H, hs[-1], xs[-1], theta
+        Hb = H if hs[i_break] > 0 else 0.0
+        return Hb, hs[i_break], xs[i_break], theta
+    
+    H, theta, c, cg = _shoaling_arrays(H_offshore, T, theta_offshore, hs)
+    
+    # First point satisfying the breaking criterion (check_breaking);
+    # h <= 0 always counts as breaking
+    breaking = (H >= gamma_b * hs) | (hs <= 0)
+    i_break = int(np.argmax(breaking))
+    
+    if breaking[i_break]:
+        Hb = H[i_break] if hs[i_break] > 0 else 0.0
+    else:
+        # Wave didn't break (shouldn't happen in practice) - values at shore
+        i_break = len(hs) - 1
+        Hb = H[i_break]
+    
+    h_break, x_break, theta_break = hs[i_break], xs[i_break], theta[i_break]
+    
+    if not return_path:
+        return Hb, h_break, x_break, theta_break
+    
+    n = i_break + 1
+    path = np.empty(n, dtype=PATH_DTYPE)
+    path['x'] = xs[:n]
+    path['h'] = hs[:n]
+    path['H'] = H[:n]
+    path['theta_rad'] = theta[:n]
+    path['theta_deg'] = np.rad2deg(theta[:n])
+    path['c'] = c[:n]
+    path['cg'] = cg[:n]
+    path['Ksr'] = H[:n] / H_offshore if H_offshore > 0 else 1.0
+    return Hb, h_break, x_break, theta_break, path
+
+
+def path_as_dicts(path):
+    """Convert a shoaling path array to a list of dicts of floats (e.g. for JSON)."""
+    names = path.dtype.names
+    return [dict(zip(names, row)) for row in path.tolist()]
+
+
+def _shoaling_arrays(H_offshore, T, theta_offshore, hs):
+    """
+    Shoal and refract a wave over every depth of a profile at once.
+    
+    Vectorized equivalent of applying shoal_and_refract() point by point.
+    Snell's law telescopes along the ray, sin(theta_i) / c_i = constant, except
+    that sin(theta) is clipped at 1; a clip resets the constant to 1 / c_i, so
+    the effective constant is min(|sin(theta_0)| / c_0, 1 / max(c_0..c_i)).
+    Wave heights accumulate the per-step Ksr in the same order as the scalar
+    recurrence.
     
-    # Step from offshore to nearshore
-    for i in range(len(profile) - 1, -1, -1):
-        x, h = profile[i]
+    Parameters:
+    -----------
+    H_offshore : float
+        Wave height at hs[0] (m)
+    T : float
+        Wave period (s)
+    theta_offshore : float
+        Wave direction at hs[0], measured from shore-normal (radians)
+    hs : np.ndarray
+        Depths ordered from offshore to nearshore (m)
         
-        # Calculate phase and group speeds at this point
-        c = phase_speed(T, h)
-        cg = group_speed(T, h)
+    Returns:
+    --------
+    H, theta, c, cg : np.ndarray
+        Wave height, direction (radians), phase and group speed at each depth
+    """
+    _, c, cg = compute_kinematics(T, hs)
+    
+    # Points with h <= 0 have c = cg = 0; they break before being propagated
+    # past, so the divisions there only need to stay quiet
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sin_theta0 = np.sin(theta_offshore)
+        invariant = np.minimum(abs(sin_theta0) / c[0], 1.0 / np.maximum.accumulate(c))
+        sin_theta = np.copysign(np.minimum(invariant * c, 1.0), sin_theta0)
         
-        # Store path point
-        if return_path:
-            path.append({
-                'x': float(x),
-                'h': float(h),
-                'H': float(H),
-                'theta_rad': float(theta),
-                'theta_deg': float(np.rad2deg(theta)),
-                'c': float(c),
-                'cg': float(cg),
-                'Ksr': float(H / H_offshore) if H_offshore > 0 else 1.0
-            })
+        theta = np.concatenate(([theta_offshore], np.arcsin(sin_theta[1:])))
+        # refract_direction leaves the direction unchanged where c <= 0
+        theta_prev = np.concatenate(([theta_offshore], theta[:-1]))
+        theta = np.where(c > 0, theta, theta_prev)
         
-        # Check breaking condition
-        is_breaking, Hb = check_breaking(H, h, gamma_b)
+        # Energy flux conservation between consecutive points
+        cos_theta = np.fmax(0.01, np.abs(np.cos(theta)))
+        ratio = (cg[:-1] * cos_theta[:-1]) / (cg[1:] * cos_theta[1:])
+        ratio = np.fmax(0.01, ratio)
         
-        if is_breaking:
-            if return_path:
-                return Hb, h, x, theta, path
-            return Hb, h, x, theta
+        H = np.multiply.accumulate(np.concatenate(([H_offshore], np.sqrt(ratio))))
+    
+    return H, theta, c, cg
+
+
+def _shoal_to_break(H_offshore, theta_offshore, c, cg, hs, gamma_b):
+    """
+    Shoal and refract point by point, stopping at the breaking point.
+    
+    Scalar-loop counterpart of _shoaling_arrays, compiled with numba when it
+    is available so that points shoreward of the break are never evaluated.
+    
+    Returns:
+    --------
+    i_break : int
+        Index of the breaking point in hs, or -1 if the wave never breaks
+    H : float
+        Wave height at i_break (or at the shore) (m)
+    theta : float
+        Wave direction at i_break (or at the shore) (radians)
+    """
+    H = H_offshore
+    theta = theta_offshore
+    n = len(hs)
+    
+    for i in range(n):
+        if hs[i] <= 0 or H >= gamma_b * hs[i]:
+            return i, H, theta
         
-        # If not breaking and not at shore, propagate to next point
-        if i > 0:
-            x_next, h_next = profile[i - 1]
-            H_new, theta_new, Ksr = shoal_and_refract(H, T, h, h_next, theta)
-            H = H_new
-            theta = theta_new
-    
-    # If we reach here, wave didn't break (shouldn't happen in practice)
-    # Return values at shore
-    x_shore, h_shore = profile[0]
-    _, Hb = check_breaking(H, h_shore, gamma_b)
-    if return_path:
-        return Hb, h_shore, x_shore, theta, path
-    return Hb, h_shore, x_shore, theta
+        if i + 1 < n:
+            # Snell's law (direction unchanged where c <= 0)
+            theta_next = theta
+            if c[i] > 0 and c[i + 1] > 0:
+                sin_next = math.sin(theta) * c[i + 1] / c[i]
+                theta_next = math.asin(min(1.0, max(-1.0, sin_next)))
+            
+            # Energy flux conservation
+            cos1 = max(0.01, abs(math.cos(theta)))
+            cos2 = max(0.01, abs(math.cos(theta_next)))
+            if cg[i + 1] > 0:
+                ratio = max(0.01, (cg[i] * cos1) / (cg[i + 1] * cos2))
+            else:
+                ratio = math.inf  # Dry next point - breaks there
+            
+            H = H * math.sqrt(ratio)
+            theta = theta_next
+    
+    return -1, H, theta
+
+
+if njit is not None:
+    _shoal_to_break = njit(cache=True)(_shoal_to_break)
 
 
 def iribarren_number(beta, H0, T):
@@ -297,12 +420,12 @@ def iribarren_number(beta, H0, T):
         return 0.0
     
     # Deep-water wavelength
-    L0 = G * T**2 / (2.0 * np.pi)
+    L0 = G * T * T / (2.0 * math.pi)
     
     if L0 <= 0:
         return 0.0
     
-    Xi = np.tan(beta) / np.sqrt(H0 / L0)
+    Xi = math.tan(beta) / math.sqrt(H0 / L0)
     return Xi
 
 
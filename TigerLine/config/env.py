@@ -0,0 +1,46 @@
+"""
+Environment detection shared by production.py and wsgi.py.
+
+Reads os.environ once per process and caches the result, so the
+PythonAnywhere checks and project path are computed in one place.
+"""
+
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class Environment(NamedTuple):
+    """Deployment environment resolved from os.environ."""
+    is_pa: bool
+    username: str
+    project_root: str
+
+
+@lru_cache(maxsize=1)
+def detect():
+    """
+    Detect whether we are running on PythonAnywhere.
+    
+    Returns:
+    --------
+    Environment
+        is_pa : True on PythonAnywhere (PYTHONANYWHERE_SITE or
+                PYTHONANYWHERE_DOMAIN set)
+        username : PythonAnywhere account name, 'username' if unset
+        project_root : Absolute path of the TigerLine project directory
+    """
+    env = os.environ
+    # Only PythonAnywhere sets these; USERNAME alone is also set on
+    # Windows dev machines and would misclassify them
+    is_pa = 'PYTHONANYWHERE_SITE' in env or 'PYTHONANYWHERE_DOMAIN' in env
+    username = env.get('USERNAME', 'username')
+    
+    if is_pa:
+        # PythonAnywhere path structure
+        project_root = f'/home/{username}/TigerLine'
+    else:
+        # Local development - directory containing config/
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    
+    return Environment(is_pa, username, project_root)
@@ -6,65 +6,106 @@ This file contains production-specific settings that differ from development.
 
 import os
 
-# Detect if running on PythonAnywhere
-is_pythonanywhere = 'PYTHONANYWHERE_DOMAIN' in os.environ or 'USERNAME' in os.environ
+from .env import detect
 
-if is_pythonanywhere:
-    # PythonAnywhere path structure
-    username = os.environ.get('USERNAME', 'username')
-    PROJECT_ROOT = f'/home/{username}/TigerLine'
-else:
-    # Local development - use current directory
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Environment detection is shared with wsgi.py
+_env = detect()
+
+# Detect if running on PythonAnywhere
+is_pythonanywhere = _env.is_pa
+PROJECT_ROOT = _env.project_root
 
-# Data directories
-DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
-OBSERVATIONS_DIR = os.path.join(DATA_DIR, 'observations')
-CALIBRATION_DIR = os.path.join(DATA_DIR, 'calibration')
-CLIMATOLOGY_DIR = os.path.join(DATA_DIR, 'climatology')
-CACHE_DIR = os.path.join(PROJECT_ROOT, 'config', 'cache')
-LOGS_DIR = os.path.join(PROJECT_ROOT, 'logs')
+# Data directories (PROJECT_ROOT never ends in a separator, so plain
+# concatenation matches os.path.join)
+_SEP = os.sep
+DATA_DIR = PROJECT_ROOT + _SEP + 'data'
+OBSERVATIONS_DIR = DATA_DIR + _SEP + 'observations'
+CALIBRATION_DIR = DATA_DIR + _SEP + 'calibration'
+CLIMATOLOGY_DIR = DATA_DIR + _SEP + 'climatology'
+CACHE_DIR = PROJECT_ROOT + _SEP + 'config' + _SEP + 'cache'
+LOGS_DIR = PROJECT_ROOT + _SEP + 'logs'
 
 # API Keys (from environment variables)
 OPENWEATHERMAP_API_KEY = os.environ.get('OPENWEATHERMAP_API_KEY', '')
 
-# CORS settings
-ALLOWED_ORIGINS = os.environ.get('ALLOWED_ORIGINS', '*').split(',')
+# CORS settings (a frozenset so per-request origin checks are hashed lookups)
+_raw_origins = os.environ.get('ALLOWED_ORIGINS', '*').strip()
+if ',' not in _raw_origins:
+    # Common case: a single origin such as '*'
+    _origins = {_raw_origins} if _raw_origins else set()
+else:
+    _origins = {origin.strip() for origin in _raw_origins.split(',') if origin.strip()}
 # If PythonAnywhere, allow the domain
 if is_pythonanywhere:
-    username = os.environ.get('USERNAME', 'username')
-    pythonanywhere_domain = f'https://{username}.pythonanywhere.com'
-    if '*' not in ALLOWED_ORIGINS:
-        ALLOWED_ORIGINS.append(pythonanywhere_domain)
+    pythonanywhere_domain = f'https://{_env.username}.pythonanywhere.com'
+    if '*' not in _origins:
+        _origins.add(pythonanywhere_domain)
+ALLOWED_ORIGINS = frozenset(_origins)
 
 # Logging configuration
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
-LOG_FILE = os.path.join(LOGS_DIR, 'app.log')
+LOG_FILE = LOGS_DIR + _SEP + 'app.log'
 
 # Flask configuration
 FLASK_ENV = 'production' if is_pythonanywhere else 'development'
 DEBUG = not is_pythonanywhere
 
+
+def _int_env(key, default):
+    """Read a non-negative integer from the environment, default if unset or malformed."""
+    value = os.environ.get(key)
+    if value:
+        value = value.strip()
+    return int(value) if value and value.isdecimal() else default
+
+
 # Cache settings
-CACHE_TTL = int(os.environ.get('CACHE_TTL', '300'))  # 5 minutes default
+CACHE_TTL = _int_env('CACHE_TTL', 300)  # 5 minutes default
+
+# Ensure all directories exist (once per process)
+_dirs_ready = False
+_DIRECTORIES_B = tuple(os.fsencode(directory) for directory in (
+    OBSERVATIONS_DIR,
+    CALIBRATION_DIR,
+    CLIMATOLOGY_DIR,
+    CACHE_DIR,
+    LOGS_DIR
+))
+
 
-# Ensure all directories exist
 def ensure_directories():
     """Create all necessary directories if they don't exist."""
-    directories = [
-        DATA_DIR,
-        OBSERVATIONS_DIR,
-        CALIBRATION_DIR,
-        CLIMATOLOGY_DIR,
-        CACHE_DIR,
-        LOGS_DIR
-    ]
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    
+    # DATA_DIR is created as the parent of the data leaves; paths are
+    # pre-encoded so the syscalls skip the str -> bytes conversion
+    directories = _DIRECTORIES_B
     
-    for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-        # Set permissions (readable/writable by owner, readable by group/others)
-        os.chmod(directory, 0o755)
+    # Create with 0o755 (readable/writable by owner, readable by group/others);
+    # a 0o022 umask lets mode= take effect without a chmod per directory
+    old_umask = os.umask(0o022)
+    try:
+        for directory in directories:
+            os.makedirs(directory, mode=0o755, exist_ok=True)
+    finally:
+        os.umask(old_umask)
+    
+    _dirs_ready = True
+
 
-# Initialize directories on import
-ensure_directories()
+def init_app(app):
+    """
+    Prepare the production environment for a Flask app.
+    
+    Creates the data, cache and log directories. Called once the app has
+    been constructed rather than when this module is imported.
+    
+    Parameters:
+    -----------
+    app : Flask
+        Application being configured
+    """
+    ensure_directories()
 
@@ -0,0 +1,49 @@
+"""
+Tests for backend.surf_model.quality.
+"""
+
+import itertools
+import math
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.surf_model import quality
+
+
+def test_surf_score_matches_np_clip_over_grid():
+    # Includes sub-score boundaries (e.g. 2/3/9 ft, 5/9/12 s, 0.2/0.8 m tide)
+    grid = itertools.product(
+        [0.0, 0.61, 0.9144, 1.5, 2.7432, 4.0],  # Hb (m)
+        [4.0, 5.0, 9.0, 12.0, 16.0],             # T (s)
+        [0.0, 10.0, 30.0],                       # theta_break (deg)
+        ['spilling', 'plunging', 'surging'],
+        [0.0, 8.0, 15.0],                        # U (m/s)
+        [90.0, 200.0, 300.0],                    # wind_dir (deg)
+        [0.0, 0.2, 0.8, 1.5],                    # eta_tide (m)
+        [75.0, 130.0, 200.0],                    # swell_dir (deg)
+    )
+    for args in grid:
+        result = quality.compute_surf_score(*args)
+        S_final = result['penalized_score'] * result['breaker_multiplier']
+        expected = float(np.clip(10.0 * S_final, 0.0, 10.0))
+        assert isinstance(result['surf_score'], float)
+        assert result['surf_score'] == expected
+
+
+def test_surf_score_propagates_nan(monkeypatch):
+    monkeypatch.setattr(quality, 'height_subscore', lambda Hb_ft: float('nan'))
+    result = quality.compute_surf_score(1.5, 10.0, 15.0, 'plunging', 3.0, 270.0, 0.2, 80.0)
+    assert math.isnan(result['surf_score'])
+
+
+def test_weights_are_copied_per_call():
+    result = quality.compute_surf_score(1.5, 10.0, 15.0, 'plunging', 3.0, 270.0, 0.2, 80.0)
+    result['weights']['H'] = 0.0
+    assert quality.SCORE_WEIGHTS['H'] == 0.30
@@ -0,0 +1,186 @@
+"""
+Tests for backend.surf_model.storage.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add project root to path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.surf_model import storage
+
+
+OFFSHORE = {'Hs': 1.2, 'Tp': 9.0, 'direction': 120.0}
+LOCAL = {'wind_speed': 3.0, 'wind_dir': 270.0, 'tide': 0.4}
+MODEL = {'Hb': 1.1, 'theta_break': 5.0, 'breaker_type': 'plunging', 'surf_score': 6.5}
+
+
+@pytest.fixture
+def obs_dir(tmp_path, monkeypatch):
+    """Point storage at an empty temporary data directory."""
+    data_dir = tmp_path / 'data'
+    monkeypatch.setattr(storage, 'DATA_DIR', str(data_dir))
+    monkeypatch.setattr(storage, 'OBSERVATIONS_DIR', str(data_dir / 'observations'))
+    monkeypatch.setattr(storage, 'CALIBRATION_DIR', str(data_dir / 'calibration'))
+    monkeypatch.setattr(storage, 'CLIMATOLOGY_DIR', str(data_dir / 'climatology'))
+    monkeypatch.setattr(storage, '_init_done', False)
+    storage._load_day.cache_clear()
+    storage.initialize_storage()
+    return data_dir / 'observations'
+
+
+def _store(timestamp, rating=None):
+    return storage.store_observation(timestamp, OFFSHORE, LOCAL, MODEL, human_rating=rating)
+
+
+def test_store_after_torn_line_keeps_new_record(obs_dir):
+    t0 = datetime(2024, 6, 1, 8, 0)
+    t1 = datetime(2024, 6, 1, 9, 0)
+    assert _store(t0)
+    
+    # Simulate an interrupted write: a partial record with no trailing newline
+    day_file = storage._get_observation_file_path(t0)
+    with open(day_file, 'ab') as f:
+        f.write(b'{"timestamp": "2024-06-01T08:30')
+    
+    assert _store(t1, rating=7)
+    
+    observations = storage.load_observations(datetime(2024, 6, 1), datetime(2024, 6, 1, 23, 59))
+    assert [obs['timestamp'] for obs in observations] == [t0.isoformat(), t1.isoformat()]
+    assert observations[1]['observation']['rating'] == 7.0
+
+
+def test_index_count_matches_after_torn_line(obs_dir):
+    t0 = datetime(2024, 6, 2, 8, 0)
+    for hour in range(3):
+        assert _store(t0.replace(hour=8 + hour), rating=5 if hour == 0 else None)
+    
+    day_file = storage._get_observation_file_path(t0)
+    with open(day_file, 'ab') as f:
+        f.write(b'{"timestamp": "2024-06-02T11:30')
+    
+    # Index the torn file, then append after it
+    assert storage.get_observation_count() == 3
+    assert _store(t0.replace(hour=12), rating=6)
+    
+    loaded = storage.load_observations(datetime(2024, 6, 2), datetime(2024, 6, 2, 23, 59))
+    assert len(loaded) == 4
+    assert storage.get_observation_count() == 4
+    assert storage._refresh_index()[os.path.basename(day_file)]['rated'] == 2
+
+
+@pytest.mark.parametrize('use_ijson', [True, False])
+def test_corrupt_legacy_file_skips_only_that_day(obs_dir, monkeypatch, use_ijson):
+    if use_ijson and storage.ijson is None:
+        pytest.skip('ijson not installed')
+    if not use_ijson:
+        monkeypatch.setattr(storage, 'ijson', None)
+    
+    good = [
+        {'timestamp': '2024-05-02T08:00:00', 'offshore': OFFSHORE},
+        {'timestamp': '2024-05-02T09:00:00', 'offshore': OFFSHORE},
+    ]
+    (obs_dir / '2024-05-01.json').write_text('[{"timestamp": "2024-05-01T08:00:00"}, {"timest')
+    (obs_dir / '2024-05-02.json').write_text(json.dumps(good))
+    
+    loaded = storage.load_observations(datetime(2024, 5, 1), datetime(2024, 5, 2, 23, 59))
+    assert [obs['timestamp'] for obs in loaded] == [obs['timestamp'] for obs in good]
+
+
+def _write_legacy(obs_dir, day, timestamps):
+    """Write a legacy JSON-array day file holding one record per timestamp."""
+    records = [{'timestamp': ts, 'offshore': OFFSHORE, 'local': LOCAL, 'model': MODEL}
+               for ts in timestamps]
+    (obs_dir / f'{day}.json').write_text(json.dumps(records))
+
+
+def test_index_sidecar_tracks_appends(obs_dir):
+    t0 = datetime(2024, 7, 1, 6, 0)
+    for hour, rating in ((6, None), (7, 8), (8, None)):
+        assert _store(t0.replace(hour=hour), rating=rating)
+    
+    day_file = storage._get_observation_file_path(t0)
+    index = json.loads((obs_dir / storage.INDEX_FILENAME).read_text())
+    entry = index[os.path.basename(day_file)]
+    assert (entry['count'], entry['rated']) == (3, 1)
+    assert entry['size'] == os.path.getsize(day_file)
+    
+    assert storage.get_observation_count() == 3
+    assert [obs['observation']['rating'] for obs in storage.get_observations_with_ratings()] == [8.0]
+
+
+def test_index_rebuilds_after_external_rewrite(obs_dir):
+    t0 = datetime(2024, 7, 2, 6, 0)
+    assert _store(t0)
+    assert _store(t0.replace(hour=7))
+    assert storage.get_observation_count() == 2
+    
+    # Rewrite the day file behind the index's back
+    day_file = storage._get_observation_file_path(t0)
+    with open(day_file, 'rb') as f:
+        first_line = f.readline()
+    with open(day_file, 'wb') as f:
+        f.write(first_line)
+    
+    assert storage.get_observation_count() == 1
+
+
+def test_parse_cache_invalidated_on_mtime_or_size_change(obs_dir):
+    t0 = datetime(2024, 7, 3, 6, 0)
+    assert _store(t0)
+    day_start, day_end = datetime(2024, 7, 3), datetime(2024, 7, 3, 23, 59)
+    day_file = storage._get_observation_file_path(t0)
+    
+    first = storage.load_observations(day_start, day_end)
+    assert first[0]['offshore']['Hs'] == 1.2
+    
+    # Same size, different content and mtime
+    with open(day_file, 'rb') as f:
+        data = f.read()
+    st = os.stat(day_file)
+    with open(day_file, 'wb') as f:
+        f.write(data.replace(b'"Hs":1.2', b'"Hs":3.4'))
+    os.utime(day_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert os.path.getsize(day_file) == st.st_size
+    assert storage.load_observations(day_start, day_end)[0]['offshore']['Hs'] == 3.4
+    
+    # Size change from an append
+    assert _store(t0.replace(hour=7))
+    assert len(storage.load_observations(day_start, day_end)) == 2
+
+
+def test_count_includes_legacy_and_jsonl_for_same_day(obs_dir):
+    _write_legacy(obs_dir, '2024-07-04', ['2024-07-04T06:00:00', '2024-07-04T07:00:00'])
+    assert _store(datetime(2024, 7, 4, 8, 0))
+    
+    # Both files hold distinct records for the day; each is counted once
+    loaded = storage.load_observations(datetime(2024, 7, 4), datetime(2024, 7, 4, 23, 59))
+    assert len(loaded) == 3
+    assert len(storage.load_day_observations(datetime(2024, 7, 4, 12, 0))) == 3
+    assert storage.get_observation_count() == 3
+
+
+def test_save_day_observations_migrates_legacy_file(obs_dir):
+    _write_legacy(obs_dir, '2024-07-05', ['2024-07-05T06:00:00', '2024-07-05T07:00:00'])
+    assert _store(datetime(2024, 7, 5, 8, 0))
+    
+    when = datetime(2024, 7, 5, 12, 0)
+    observations = storage.load_day_observations(when)
+    observations[0]['observation'] = {'rating': 6.0, 'tags': ['mushy']}
+    storage.save_day_observations(when, observations)
+    
+    assert not (obs_dir / '2024-07-05.json').exists()
+    assert not (obs_dir / '2024-07-05.jsonl.tmp').exists()
+    
+    reloaded = storage.load_day_observations(when)
+    assert [obs['timestamp'] for obs in reloaded] == [obs['timestamp'] for obs in observations]
+    assert reloaded[0]['observation'] == {'rating': 6.0, 'tags': ['mushy']}
+    assert storage.get_observation_count() == 3
+    assert len(storage.get_observations_with_ratings()) == 1
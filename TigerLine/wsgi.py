@@ -8,34 +8,39 @@ PythonAnywhere looks for a variable named 'application' in this file.
 import sys
 import os
 
-# Detect if running on PythonAnywhere
-# PythonAnywhere sets USERNAME environment variable
-is_pythonanywhere = 'PYTHONANYWHERE_DOMAIN' in os.environ or 'USERNAME' in os.environ
 
-if is_pythonanywhere:
+def _install_path(path):
+    """Put path first on sys.path; re-imports find it already in place."""
+    if not sys.path or sys.path[0] != path:
+        sys.path[:] = [path] + [p for p in sys.path if p != path]
+
+
+# Bootstrap the project path from the environment alone: on PythonAnywhere
+# this file is usually copied to /var/www/, away from the project, so no
+# project module can be imported until the path is installed.
+# Keep in sync with config/env.py.
+if 'PYTHONANYWHERE_SITE' in os.environ or 'PYTHONANYWHERE_DOMAIN' in os.environ:
     # PythonAnywhere path structure
-    # Get username from environment or use default
-    username = os.environ.get('USERNAME', 'username')
-    path = f'/home/{username}/TigerLine'
+    path = f"/home/{os.environ.get('USERNAME', 'username')}/TigerLine"
 else:
     # Local development - use current directory
     path = os.path.dirname(os.path.abspath(__file__))
 
 # Add project directory to path
-if path not in sys.path:
-    sys.path.insert(0, path)
+_install_path(path)
+
+from config.env import detect
 
-# Set environment variables
-os.environ['FLASK_APP'] = 'backend.api.server'
-os.environ['FLASK_ENV'] = 'production' if is_pythonanywhere else 'development'
+env = detect()
+is_pythonanywhere = env.is_pa
 
-# Import Flask app
-from backend.api.server import app
+# Build Flask app
+from backend.api.server import create_app
 
 # PythonAnywhere looks for 'application'
-application = app
+application = create_app()
 
 # For local testing
 if __name__ == '__main__':
-    app.run(debug=not is_pythonanywhere)
+    application.run(debug=not is_pythonanywhere)
 